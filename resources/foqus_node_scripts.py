@@ -2,22 +2,21 @@
 # Last Reviewed: 02/10/2026 - 4:30 PM
 
 import pandas as pd
-import olca_schema as olca
-
-from netlolca.NetlOlca import NetlOlca
 
 import src as lca_prommis
 
 params = my_parameters.copy() # get a copy of the parameters df
 
-for count, row in params.iterrows():
-    if x[row['parameter_description']] is not None:
-        row['parameter_value'] = float(x[row['parameter_description']]) 
-    else:
-        row['parameter_value'] = 0
+params['parameter_value'] = [
+    float(x[desc]) if x[desc] is not None else 0
+    for desc in params['parameter_description']
+]
 
 parameter_set_name = "Baseline" # get the parameter_set name
 
+# connect to openLCA (the connection is reused between trials)
+netl = lca_prommis.get_olca_client()
+
 param_set_ref = lca_prommis.run_analysis.update_parameter ( netl, 
                                                             ps_uuid, 
                                                             parameter_set_name, 
@@ -26,13 +25,14 @@ param_set_ref = lca_prommis.run_analysis.update_parameter ( netl,
 result = lca_prommis.run_analysis.run_analysis (netl, 
                                                 ps_uuid, 
                                                 impact_method_uuid, 
-                                                param_set_ref)
+                                                param_set_ref.parameters)
 result.wait_until_ready()
-total_impacts = lca_prommis.generate_total_results.generate_total_results(result)
+total_impacts = lca_prommis.generate_total_results.generate_total_results(
+    result, save=False
+)
 
 # save the total impacts to the node outputs
-for result in total_impacts:
-    f[result['name']] = result['value']
+f.update(zip(total_impacts['name'], total_impacts['amount']))
 
 
 # TODO: add 'parameter_description' column to params df                     --> Done
@@ -53,10 +53,9 @@ from netlolca.NetlOlca import NetlOlca
 import prommis.uky.uky_flowsheet as uky 
 import src as lca_prommis
 
-from pyomo.environ import TransformationFactory
+from pyomo.environ import SolverFactory
 from idaes.core.util.model_diagnostics import DiagnosticsToolbox
 from prommis.uky.costing.ree_plant_capcost import QGESSCostingData
-import prommis.uky.uky_flowsheet as uky
 
 home_dir = os.path.expanduser("~")
 
@@ -70,26 +69,27 @@ if "Leach liquid feed" in x:
 if "split_fraction" in x:
 	m.fs.load_sep.split_fraction[0.0, 'recycle'].fix(x["split_fraction"])
 
+# Scaling factors are attached to the model's scaling_factor suffixes; IPOPT
+# reads them with user-scaling, so the model is solved directly (no scaled
+# clone and no propagate_solution)
 uky.set_scaling(m)
 
-scaling = TransformationFactory("core.scale_model")
-scaled_model = scaling.create_using(m, rename=False)
+scaled_solver = SolverFactory("ipopt")
+scaled_solver.options["nlp_scaling_method"] = "user-scaling"
+scaled_solver.options["linear_system_scaling"] = "mc19"
 
-if uky.degrees_of_freedom(scaled_model) != 0:
+if uky.degrees_of_freedom(m) != 0:
     raise AssertionError("Degrees of freedom != 0")
 
-uky.initialize_system(scaled_model)
-uky.solve_system(scaled_model)
+uky.initialize_system(m)
+uky.solve_system(m, solver=scaled_solver)
 
-uky.fix_organic_recycle(scaled_model)
-scaled_results = uky.solve_system(scaled_model)
+uky.fix_organic_recycle(m)
+results = uky.solve_system(m, solver=scaled_solver)
 
-if not uky.check_optimal_termination(scaled_results):
+if not uky.check_optimal_termination(results):
     raise RuntimeError("Solver failed to terminate optimally")
 
-# Propagate results back to original model
-results = scaling.propagate_solution(scaled_model, m)
-
 # 5. Add Costing (Optional, but likely needed for optimization)
 uky.add_costing(m)
 
@@ -105,26 +105,7 @@ prommis_data = lca_prommis.data_lca.get_lca_df(m)
 
 df = lca_prommis.convert_lca.convert_flows_to_lca_units(prommis_data, hours=1, mol_to_kg=True, water_unit='m3')
 
-REO_list = [
-    "Yttrium Oxide",
-    "Lanthanum Oxide",
-    "Cerium Oxide",
-    "Praseodymium Oxide",
-    "Neodymium Oxide",
-    "Samarium Oxide",
-    "Gadolinium Oxide",
-    "Dysprosium Oxide",
-]
-
-df = lca_prommis.final_lca.merge_flows(df, merge_source='Solid Feed', new_flow_name='374 ppm REO Feed', value_2_merge=REO_list)
-
-
-df = lca_prommis.final_lca.merge_flows(df, merge_source='Roaster Product', new_flow_name='73.4% REO Product')
-
-
-df = lca_prommis.final_lca.merge_flows(df, merge_source='Wastewater', new_flow_name='Wastewater', merge_column='Category') 
-
-df = lca_prommis.final_lca.merge_flows(df, merge_source='Solid Waste', new_flow_name='Solid Waste', merge_column='Category') 
+df = lca_prommis.final_lca.merge_flows_batch(df, lca_prommis.final_lca.uky_merge_specs)
 
 finalized_df = lca_prommis.final_lca.finalize_df(
         df=df, 
@@ -133,12 +114,9 @@ finalized_df = lca_prommis.final_lca.finalize_df(
         water_type='raw fresh water'
     )
 
-output_dir = os.path.join(home_dir, 'output')
-
-if not os.path.exists(output_dir):
-	os.makedirs(output_dir)
-
-finalized_df.to_csv(os.path.join(output_dir, "finalized_df.csv"), index=False)
+if lca_prommis.save_trial_exchanges:
+    output_dir = os.path.join(home_dir, 'output')
+    os.makedirs(output_dir, exist_ok=True)
+    finalized_df.to_csv(os.path.join(output_dir, "finalized_df.csv"), index=False)
 
-for _, row in finalized_df.iterrows():
-    f[row['Flow_Name']] = row['LCA_Amount']
\ No newline at end of file
+f.update(zip(finalized_df['Flow_Name'], finalized_df['LCA_Amount']))
\ No newline at end of file
@@ -18,6 +18,22 @@ import src.plot_results as plot_results
 #---------------------------------------------------------------------------------------
 output_dir = os.path.join(os.path.expanduser("~"), ".netl")
 
+# Unsolved flowsheet models that the optimizer trials of a run clone, keyed by
+# model name and trial_run_id (see the PrOMMiS node script in foqus_class.py);
+# cleared by NetlFoqus.run_optimization at the start of every run
+trial_models = {}
+
+# Identifier of the current optimization run (set by
+# NetlFoqus.run_optimization)
+trial_run_id = None
+
+# Whether the PrOMMiS node script saves each trial's finalized exchange table
+# (finalized_df.csv in the output directory; overwritten every trial)
+save_trial_exchanges = False
+
+# Connected NetlOlca clients, by IPC port (see get_olca_client)
+olca_clients = {}
+
 def setup_output_directory(working_dir):
     """
     Helper method to check if the working directory exists and create it if it doesn't.
@@ -31,7 +47,7 @@ def setup_output_directory(working_dir):
     """
     if not os.path.isdir(working_dir):
         try:
-            os.makedirs(working_dir)
+            os.makedirs(working_dir, exist_ok=True)
         except:
             logging.warning("Failed to create folder %s!" % working_dir)
             try:
@@ -49,4 +65,48 @@ def setup_output_directory(working_dir):
     else:
         output_dir = os.path.expanduser("~")
 
-    return output_dir
\ No newline at end of file
+    return output_dir
+
+
+def get_olca_client(port=None):
+    """
+    Helper method to return a NetlOlca client connected to openLCA.
+    One client is created and connected per IPC port on the first call and
+    reused by later calls, e.g., by the openLCA node script on every
+    optimizer trial (each worker can use its own openLCA instance, and so
+    its own port).
+    Before a cached client is returned, a light query checks that the
+    connection is still alive; if it fails (e.g., openLCA was restarted),
+    the client is connected again.
+
+    Parameters
+    ----------
+    port : int, optional
+        The openLCA IPC port. Defaults to None, which uses the OLCA_PORT
+        environment variable if it is set, else the NetlOlca default port.
+
+    """
+    if port is None:
+        port = os.environ.get("OLCA_PORT")
+    if port is not None:
+        port = int(port)
+
+    netl = olca_clients.get(port)
+    if netl is not None:
+        import olca_schema as olca
+        try:
+            netl.client.get_descriptors(olca.Currency)
+            return netl
+        except Exception as e:
+            logging.warning("Reconnecting to openLCA (port %s): %s", port, e)
+            del olca_clients[port]
+
+    from netlolca.NetlOlca import NetlOlca
+    netl = NetlOlca()
+    if port is None:
+        netl.connect()
+    else:
+        netl.connect(port)
+    netl.read()
+    olca_clients[port] = netl
+    return netl
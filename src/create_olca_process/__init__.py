@@ -2,14 +2,18 @@
 # -*- coding: utf-8 -*-
 
 from src.create_olca_process.create_exchange_database import create_exchange_database
+from src.create_olca_process.create_exchange_database import get_exchange_database
 from src.create_olca_process.create_exchange_elementary_flow import create_exchange_elementary_flow
 from src.create_olca_process.create_exchange_pr_wa_flow import create_exchange_pr_wa_flow
 from src.create_olca_process.create_new_process import create_new_process
 from src.create_olca_process.find_processes_by_flow import find_processes_by_flow
+from src.create_olca_process.find_processes_by_flow import index_exchanges
 from src.create_olca_process.flow_search_function import search_Flows_by_keywords
 from src.create_olca_process.search_flows_and_providers import main as search_flows
 from src.create_olca_process.search_flows_and_providers import search_and_select
 from src.create_olca_process.search_flows_only import search_and_select_flows
 from src.create_olca_process.create_exchange_ref_flow import create_exchange_ref_flow
 from src.create_olca_process.create_exchange_ref_flow import create_exchange_ref_existing_flow
-from src.create_olca_process.create_exchange_ref_flow import create_exchange_ref_new_flow
\ No newline at end of file
+from src.create_olca_process.create_exchange_ref_flow import create_exchange_ref_new_flow
+from src.create_olca_process.flow_cache import prefetch_flows
+from src.create_olca_process.flow_cache import clear_flow_cache
@@ -6,6 +6,11 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
+import glob
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import olca_schema as olca
 import pandas as pd
 
@@ -30,35 +35,187 @@ The function takes one main argument/input:
 
 1.  client object (IPC client)
 
+Because building the data frame queries every process in the database (which
+may take a couple of minutes), :func:`get_exchange_database` can save it to a
+CSV file and read it back on later runs. The cache is opt-in (pass
+``use_cache=True``); it only helps while the process list is unchanged (e.g.,
+several batch LCA jobs against the same database), since each new process
+changes the cache key. The file name includes a hash of the database's process
+UUIDs and names, and of their last change time stamps and versions where the
+process descriptors include them, so a new file is created when processes are
+added, removed, renamed, or (where time stamps are available) edited.
+Because edits to a process's exchanges are only detected through those
+time stamps, use ``refresh=True`` whenever processes may have been edited in
+openLCA since the cache was written.
+The file is written atomically, so several Python processes (e.g., batch LCA
+jobs) can share one cache folder: the first one builds the file and the others
+read it, and none of them ever reads a partially written file. Older cache
+files are removed when a new one is written, and only the latest data frame is
+kept in memory.
+
 """
 __all__ = [
     "create_exchange_database",
+    "get_exchange_database",
 ]
 
 
+###############################################################################
+# GLOBALS
+###############################################################################
+exchange_cache_dir = os.path.join(os.path.expanduser("~"), ".netl", "cache")
+'''str : Default folder for the cached exchange database CSV files.'''
+
+_CACHE_PREFIX = "exchange_db_"
+'''str : File name prefix of the cached exchange database CSV files.'''
+
+_latest_exchange_database = (None, None)
+'''tuple : The cache file path and data frame of the latest cached exchange
+database read or written in this process.'''
+
+
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
-def create_exchange_database(client):
+def create_exchange_database(client, process_descriptors=None, max_workers=16):
     """Create a data frame with all exchanges that are outputs and their
-    respective process universally unique identifiers."""
+    respective process universally unique identifiers.
+
+    Processes are queried concurrently on a thread pool, since each query is
+    an independent IPC round-trip to openLCA.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        An instance of NetlOlca class.
+    process_descriptors : list, optional
+        Process descriptors (olca.Ref) to read exchanges from.
+        Defaults to None, which reads all processes in the database.
+    max_workers : int, optional
+        The number of threads used to query processes. Defaults to 16.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A data frame with columns 'process_uuid', 'exchange_uuid', and
+        'process_name'.
+    """
     # get all processes
-    process_descriptors = client.get_descriptors(olca.Process)
+    if process_descriptors is None:
+        process_descriptors = client.get_descriptors(olca.Process)
 
     exchange_database = []
 
-    # get all exchanges
-    for process in process_descriptors:
-        process = client.query(olca.Process, process.id)
-        for exchange in process.exchanges:
-            # Only include output exchanges that have a flow attached
-            if (not exchange.is_input
-                    and getattr(exchange, 'flow', None) is not None):
-                exchange_database.append({
-                    'process_uuid': process.id,
-                    'exchange_uuid': exchange.flow.id,
-                    'process_name': process.name,
-                })
+    # get all exchanges; each process's output exchanges are read as soon
+    # as its query returns, so full process objects are not all held at once
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for rows in executor.map(
+            lambda x: _output_exchanges(client.query(olca.Process, x.id)),
+            process_descriptors
+        ):
+            exchange_database.extend(rows)
     exchange_database = pd.DataFrame(exchange_database)
 
     return exchange_database
+
+
+def _output_exchanges(process):
+    """Helper function to return the exchange database rows of a process
+    (i.e., its output exchanges that have a flow attached)."""
+    return [
+        {
+            'process_uuid': process.id,
+            'exchange_uuid': exchange.flow.id,
+            'process_name': process.name,
+        }
+        for exchange in process.exchanges
+        if (not exchange.is_input
+            and getattr(exchange, 'flow', None) is not None)
+    ]
+
+
+def get_exchange_database(client, cache_dir=None, use_cache=False,
+                          refresh=False):
+    """Return the exchange database, optionally reading it from a CSV cache
+    file when the processes in the openLCA database have not changed.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        An instance of NetlOlca class.
+    cache_dir : str, optional
+        Folder for the cache file (e.g., '/dev/shm' to keep it in memory on
+        Linux). Defaults to None, which uses ``exchange_cache_dir``.
+    use_cache : bool, optional
+        Whether to read and write the cache. Defaults to False, which builds
+        the exchange database without touching the disk.
+    refresh : bool, optional
+        Whether to rebuild (and re-cache) the exchange database even if a
+        cache file exists. Only used with use_cache. Defaults to False.
+
+    Returns
+    -------
+    pandas.DataFrame
+        See :func:`create_exchange_database`. With use_cache, the same data
+        frame object may be returned for repeated calls, so do not modify it
+        in place.
+    """
+    global _latest_exchange_database
+    process_descriptors = client.get_descriptors(olca.Process)
+    if not use_cache:
+        return create_exchange_database(client, process_descriptors)
+
+    if cache_dir is None:
+        cache_dir = exchange_cache_dir
+    cache_path = os.path.join(
+        cache_dir,
+        f"{_CACHE_PREFIX}{_database_key(process_descriptors)}.csv"
+    )
+    if not refresh:
+        latest_path, latest_database = _latest_exchange_database
+        if latest_path == cache_path:
+            return latest_database
+        try:
+            exchange_database = pd.read_csv(cache_path, dtype=str)
+        except OSError:
+            pass
+        else:
+            _latest_exchange_database = (cache_path, exchange_database)
+            return exchange_database
+
+    exchange_database = create_exchange_database(client, process_descriptors)
+    if not exchange_database.empty:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file and rename it, so other processes never
+        # read a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        exchange_database.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+        _prune_cache(cache_dir, keep=cache_path)
+        _latest_exchange_database = (cache_path, exchange_database)
+
+    return exchange_database
+
+
+def _prune_cache(cache_dir, keep):
+    """Helper function to remove the exchange database cache files (other
+    than keep) from a folder."""
+    for file_path in glob.glob(os.path.join(cache_dir, f"{_CACHE_PREFIX}*.csv")):
+        if file_path != keep:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+
+def _database_key(process_descriptors):
+    """Helper function to hash process UUIDs, names, and (where available)
+    last change time stamps and versions into a cache key."""
+    digest = hashlib.sha1()
+    for key in sorted(
+        f"{x.id}:{x.name}:{getattr(x, 'last_change', None)}:"
+        f"{getattr(x, 'version', None)}"
+        for x in process_descriptors
+    ):
+        digest.update(key.encode("utf-8"))
+    return digest.hexdigest()[:16]
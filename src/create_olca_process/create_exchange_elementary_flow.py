@@ -7,7 +7,11 @@
 # DEPENDENCIES
 ###############################################################################
 import olca_schema as olca
-import olca_schema.units as o_units
+
+from src.create_olca_process.flow_cache import get_flow
+from src.create_olca_process.unit_lookup import canonical_unit
+from src.create_olca_process.unit_lookup import property_ref_cached
+from src.create_olca_process.unit_lookup import unit_ref_cached
 
 
 ###############################################################################
@@ -72,6 +76,7 @@ def create_exchange_elementary_flow(client,
         * If amount is provided and there is no need for a parameter to be defined, amount_formula can be None
         * If both an amount and an amount formula are provided, the amount formula will be used (override the amount)
             In this case, the amount will be ignored and can be considered redundant.
+        * amount may be None when only an amount formula is used.
 
     Raises
     ------
@@ -79,9 +84,12 @@ def create_exchange_elementary_flow(client,
         Failed to find flow or flow property in openLCA database or the flow
         type is not an elementary flow type.
     """
+    # Normalize the unit name once for all look-ups below
+    unit = canonical_unit(unit)
+
     # Get flow and make additional checks
     # - it exists and it is an elementary flow
-    flow: olca.Flow = client.query(olca.Flow, flow_uuid)
+    flow: olca.Flow = get_flow(client, flow_uuid)
     if flow is None:
         raise ValueError(f"Flow not found: {flow_uuid}")
     if flow.flow_type != olca.FlowType.ELEMENTARY_FLOW:
@@ -93,9 +101,7 @@ def create_exchange_elementary_flow(client,
     # this would be the one that help define the unit of the flow (e.g., mass,
     # volume, energy, etc.), and flow.flow_properties is a list of
     # FlowPropertyFactors we want the one that is_ref_flow_property = true
-    flow_property = o_units.property_ref(unit)
-    if flow_property is None:
-        flow_property = o_units.property_ref(unit.lower())
+    flow_property = property_ref_cached(unit)
     if flow_property is None:
         raise ValueError(
             "The flow property is not found in the flow. "
@@ -115,10 +121,8 @@ def create_exchange_elementary_flow(client,
 
 	# Set the FlowProperty reference on the exchange
     exchange.flow_property = flow_property
-    exchange.unit = o_units.unit_ref(unit)
-    if exchange.unit is None:
-        exchange.unit = o_units.unit_ref(unit.lower())
-    exchange.amount = float(amount)
+    exchange.unit = unit_ref_cached(unit)
+    exchange.amount = None if amount is None else float(amount)
     exchange.amount_formula = amount_formula
     exchange.is_input = is_input
 
@@ -6,8 +6,14 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
+from functools import partial
+
 import olca_schema as olca
-import olca_schema.units as o_units
+
+from src.create_olca_process.flow_cache import get_flow
+from src.create_olca_process.unit_lookup import canonical_unit
+from src.create_olca_process.unit_lookup import property_ref_cached
+from src.create_olca_process.unit_lookup import unit_ref_cached
 
 
 ###############################################################################
@@ -41,6 +47,13 @@ __all__ = [
 ]
 
 
+###############################################################################
+# GLOBALS
+###############################################################################
+_PROCESS_REF = partial(olca.Ref, ref_type=olca.RefType.Process)
+'''functools.partial : Builds a process reference from keyword arguments.'''
+
+
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
@@ -82,6 +95,7 @@ def create_exchange_pr_wa_flow(client,
         * If amount is provided and there is no need for a parameter to be defined, amount_formula can be None
         * If both an amount and an amount formula are provided, the amount formula will be used (override the amount)
             In this case, the amount will be ignored and can be considered redundant.
+        * amount may be None when only an amount formula is used.
 
     Raises
     ------
@@ -89,18 +103,19 @@ def create_exchange_pr_wa_flow(client,
         Failed to find flow or flow property in openLCA database or the flow
         type is not an product or waste flow type.
     """
+    # Normalize the unit name once for all look-ups below
+    unit = canonical_unit(unit)
+
     # Get flow and make additional checks
     # - it exists and it is a product or waste flow
-    flow = client.query(olca.Flow, flow_uuid) # returns a olca.Flow object
+    flow = get_flow(client, flow_uuid) # returns a olca.Flow object
     if flow is None:
         raise ValueError(f"Flow not found: {flow_uuid}")
     if flow.flow_type != olca.FlowType.PRODUCT_FLOW and flow.flow_type != olca.FlowType.WASTE_FLOW:
         raise ValueError("Provided flow is not a PRODUCT or WASTE flow")
 
     # Get reference flow property
-    flow_property = o_units.property_ref(unit)
-    if flow_property is None:
-        flow_property = o_units.property_ref(unit.lower())
+    flow_property = property_ref_cached(unit)
     if flow_property is None:
         raise ValueError(
             "The flow property is not found in the flow. "
@@ -111,14 +126,10 @@ def create_exchange_pr_wa_flow(client,
     exchange = client.make_exchange()
     exchange.flow = flow
     exchange.flow_property = flow_property
-    exchange.unit = o_units.unit_ref(unit)
-    if exchange.unit is None:
-        exchange.unit = o_units.unit_ref(unit.lower())
-    exchange.amount = float(amount)
+    exchange.unit = unit_ref_cached(unit)
+    exchange.amount = None if amount is None else float(amount)
     exchange.amount_formula = amount_formula
     exchange.is_input = is_input
-    exchange.default_provider = olca.Ref.from_dict(
-        {"@type": "Process", "@id": provider_uuid}
-    )
+    exchange.default_provider = _PROCESS_REF(id=provider_uuid)
 
     return exchange
@@ -6,12 +6,18 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import olca_schema as olca
-import olca_schema.units as o_units
 
+from src.create_olca_process.flow_cache import get_flow
+from src.create_olca_process.flow_cache import invalidate_flow
 from src.create_olca_process.search_flows_only import search_and_select_flows
+from src.create_olca_process.unit_lookup import canonical_unit
+from src.create_olca_process.unit_lookup import property_ref_cached
+from src.create_olca_process.unit_lookup import unit_ref_cached
 
 
 ###############################################################################
@@ -56,13 +62,74 @@ __all__ = [
 ]
 
 
+###############################################################################
+# GLOBALS
+###############################################################################
+_put_lock = threading.Lock()
+'''threading.Lock : Serializes writes to openLCA across threads.'''
+
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
-def create_exchange_ref_flow(client,flowName, amount, amount_formula, unit, isInput, isRef):
-    """Request from user the new flow or existing flow for the reference exchange.
+def create_exchange_ref_flow(client,
+                             flowName,
+                             amount,
+                             amount_formula,
+                             unit,
+                             isInput,
+                             isRef,
+                             mode=None,
+                             flow_uuid=None):
+    """Create the reference exchange from a new or an existing flow.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        An instance of NetlOlca class.
+    flowName : str
+        The name of the new flow (only used when mode is 'new').
+    amount : float
+        The amount of the flow.
+    amount_formula : str
+        Formula for the flow amount.
+    unit : str
+        The unit of the flow.
+    isInput : bool
+        Whether the flow is an input or output.
+    isRef : bool
+        Whether the flow is the quantitative reference.
+    mode : str, optional
+        Either 'existing' (select an existing flow) or 'new' (create a new
+        flow). Defaults to None, which asks the user.
+    flow_uuid : str, optional
+        The uuid of the existing flow (only used when mode is 'existing').
+        Defaults to None, which starts an interactive flow search.
+
+    Returns
+    -------
+    olca-schema.Exchange
+
+    Raises
+    ------
+    ValueError
+        Invalid mode.
     """
-    # Get input from user
+    if mode is None:
+        mode = _prompt_ref_flow_mode()
+
+    if mode == "existing":
+        if flow_uuid is None:
+            flow_uuid = search_and_select_flows(keywords=None, client=client)
+        return create_exchange_ref_existing_flow(client, flow_uuid, amount, amount_formula, unit)
+    elif mode == "new":
+        return create_exchange_ref_new_flow(client, flowName, amount, amount_formula, unit, isInput, isRef)
+    else:
+        raise ValueError("Invalid choice")
+
+
+def _prompt_ref_flow_mode():
+    """Request from user the new flow or existing flow for the reference
+    exchange."""
     print (
         "Do you want to select an existing quantitative reference flow or "
         "create a new one?"
@@ -70,13 +137,7 @@ def create_exchange_ref_flow(client,flowName, amount, amount_formula, unit, isIn
     print ("1. Select existing flow")
     print ("2. Create new flow")
     choice = input("Enter your choice (1 or 2): ")
-    if choice == "1":
-        flow_uuid = search_and_select_flows(keywords=None, client=client)
-        return create_exchange_ref_existing_flow(client, flow_uuid, amount, amount_formula, unit)
-    elif choice == "2":
-        return create_exchange_ref_new_flow(client, flowName, amount, amount_formula, unit, isInput, isRef)
-    else:
-        raise ValueError("Invalid choice")
+    return {"1": "existing", "2": "new"}.get(choice, choice)
 
 
 def create_exchange_ref_existing_flow(client, flow_uuid, amount, amount_formula, unit):
@@ -106,22 +167,23 @@ def create_exchange_ref_existing_flow(client, flow_uuid, amount, amount_formula,
         * If amount is provided and there is no need for a parameter to be defined, amount_formula can be None
         * If both an amount and an amount formula are provided, the amount formula will be used (override the amount)
             In this case, the amount will be ignored and can be considered redundant.
+        * amount may be None when only an amount formula is used.
 
     Returns
     -------
     olca-schema.Exchange
     """
+    # Normalize the unit name once for all look-ups below
+    unit = canonical_unit(unit)
+
     # Get flow and make additional checks
     # - it exists and it is a product or waste flow
-    flow = client.query(olca.Flow, flow_uuid) # returns a olca.Flow object
+    flow = get_flow(client, flow_uuid) # returns a olca.Flow object
     if flow is None:
         raise ValueError(f"Flow not found: {flow_uuid}")
 
     # Get reference flow property
-    factor = next((f for f in flow.flow_properties if f.is_ref_flow_property), flow.flow_properties[0])
-    flow_property = o_units.property_ref(unit)
-    if flow_property is None:
-        flow_property = o_units.property_ref(unit.lower())
+    flow_property = property_ref_cached(unit)
     if flow_property is None:
         raise ValueError(
             "The flow property is not found in the flow. "
@@ -132,10 +194,8 @@ def create_exchange_ref_existing_flow(client, flow_uuid, amount, amount_formula,
     exchange = client.make_exchange()
     exchange.flow = flow
     exchange.flow_property = flow_property.to_ref() if hasattr(flow_property, "to_ref") else flow_property
-    exchange.unit = o_units.unit_ref(unit)
-    if exchange.unit is None:
-        exchange.unit = o_units.unit_ref(unit.lower())
-    exchange.amount = amount
+    exchange.unit = unit_ref_cached(unit)
+    exchange.amount = None if amount is None else float(amount)
     exchange.amount_formula = amount_formula
     exchange.is_input = False
     exchange.is_quantitative_reference = True
@@ -152,9 +212,7 @@ def create_exchange_ref_new_flow(client,
                                  isRef):
     """Create exchange for reference flow using a new flow."""
     # Get unit object from unit name passed in the function
-    unit_obj = o_units.unit_ref(unit)
-    if unit_obj is None:
-        unit_obj = o_units.unit_ref(unit.lower())
+    unit_obj = unit_ref_cached(unit)
 
     # Find a flow property that contains this unit.
     flow_property = find_flow_property_for_unit(client, unit_obj)
@@ -187,7 +245,9 @@ def create_exchange_ref_new_flow(client,
     )
 
     # Save the flow to the database first.
-    saved_flow = client.client.put(ex_flow)
+    with _put_lock:
+        saved_flow = client.client.put(ex_flow)
+    invalidate_flow(saved_flow.id)
     print(f"Created flow: {saved_flow.name} with ID: {saved_flow.id}")
 
     # Create a flow reference for the exchange.
@@ -214,6 +274,10 @@ def find_flow_property_for_unit(client, unit_obj):
     """
     Find a flow property that contains the given unit.
 
+    The first call for a client builds an index of all units in its openLCA
+    database (see :func:`_get_or_build_unit_index`); later calls are
+    dictionary look-ups.
+
     Parameters
     ----------
     client: NetlOlca
@@ -227,33 +291,82 @@ def find_flow_property_for_unit(client, unit_obj):
         A flow property containing this unit or None if not found.
     """
     try:
-        # Get all flow properties using NetlOlca's method
-        flow_properties = client.get_all(olca.FlowProperty)
-
-        # Search through flow properties to find one that has the unit in its
-        # unit group
-        for flow_property in flow_properties:
-            if (hasattr(flow_property, 'unit_group')
-                    and flow_property.unit_group):
-                # Get the unit group
-                if hasattr(flow_property.unit_group, 'id'):
-                    unit_group = client.client.get(
-                        olca.UnitGroup,
-                        flow_property.unit_group.id
-                    )
-                    if hasattr(unit_group, 'units') and unit_group.units:
-                        for unit in unit_group.units:
-                            if hasattr(unit, 'id') and hasattr(unit_obj, 'id'):
-                                if unit.id == unit_obj.id:
-                                    return flow_property
-                            elif (hasattr(unit, 'name')
-                                    and hasattr(unit_obj, 'name')):
-                                if unit.name == unit_obj.name:
-                                    return flow_property
+        by_id, by_name = _get_or_build_unit_index(client)
     except Exception as e:
         print(f"Error finding flow property for unit: {e}")
+        return None
+
+    flow_property = by_id.get(getattr(unit_obj, 'id', None))
+    if flow_property is None:
+        flow_property = by_name.get(getattr(unit_obj, 'name', None))
+
+    return flow_property
+
+
+def _get_or_build_unit_index(client):
+    """Return the client's unit index, building it on first use.
+
+    The index is stored on the client object, so a client connected to
+    another openLCA database (or port) never reads a stale index.
+    """
+    unit_index = getattr(client, "_unit_index", None)
+    if unit_index is None:
+        unit_index = _build_unit_index(client)
+        client._unit_index = unit_index
+    return unit_index
 
-    return None
+
+def _build_unit_index(client):
+    """Helper function to map units to the flow properties that contain them.
+
+    Each unit group is fetched once over IPC, regardless of how many flow
+    properties share it. Where a unit belongs to more than one flow property,
+    the first flow property found is kept.
+
+    Parameters
+    ----------
+    client: NetlOlca
+        Client object.
+
+    Returns
+    -------
+    tuple
+        A tuple of length two:
+
+        - dict, unit UUID to olca.FlowProperty
+        - dict, unit name to olca.FlowProperty
+    """
+    by_id = {}
+    by_name = {}
+
+    # Get all flow properties using NetlOlca's method
+    flow_properties = [
+        x for x in client.get_all(olca.FlowProperty)
+        if getattr(x.unit_group, 'id', None) is not None
+    ]
+
+    # Fetch each distinct unit group once, overlapping the IPC calls
+    unit_group_ids = list(dict.fromkeys(
+        x.unit_group.id for x in flow_properties
+    ))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        unit_groups = dict(zip(
+            unit_group_ids,
+            executor.map(
+                lambda x: client.client.get(olca.UnitGroup, x),
+                unit_group_ids
+            )
+        ))
+
+    for flow_property in flow_properties:
+        unit_group = unit_groups[flow_property.unit_group.id]
+        for unit in getattr(unit_group, 'units', None) or []:
+            if getattr(unit, 'id', None):
+                by_id.setdefault(unit.id, flow_property)
+            if getattr(unit, 'name', None):
+                by_name.setdefault(unit.name, flow_property)
+
+    return (by_id, by_name)
 
 
 def generate_id(prefix: str = "entity") -> str:
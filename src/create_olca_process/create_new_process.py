@@ -7,8 +7,9 @@
 # DEPENDENCIES
 ###############################################################################
 import logging
-import uuid
 import datetime
+from collections import namedtuple
+from functools import partial
 
 import pandas as pd
 import olca_schema as olca
@@ -18,7 +19,12 @@ from src.create_olca_process.search_flows_and_providers import search_and_select
 from src.create_olca_process.create_exchange_elementary_flow import create_exchange_elementary_flow
 from src.create_olca_process.create_exchange_pr_wa_flow import create_exchange_pr_wa_flow
 from src.create_olca_process.create_exchange_database import create_exchange_database
+from src.create_olca_process.create_exchange_database import get_exchange_database
 from src.create_olca_process.create_exchange_ref_flow import create_exchange_ref_flow
+from src.create_olca_process.create_exchange_ref_flow import generate_id
+from src.create_olca_process.find_processes_by_flow import index_exchanges
+from src.create_olca_process.flow_cache import clear_flow_cache
+from src.create_olca_process.flow_cache import prefetch_flows
 
 
 ###############################################################################
@@ -45,15 +51,43 @@ __all__ = [
 # GLOBALS
 ###############################################################################
 logger = logging.getLogger(__name__)
+'''logging.Logger : Module logger for errors and warnings.'''
+
+_PROCESS_SCOPE = ParameterScope.PROCESS_SCOPE
+'''olca_schema.ParameterScope : Scope of the process parameters.'''
+
+_ExchangeRow = namedtuple('_ExchangeRow', [
+    'Flow_Name',
+    'LCA_Amount',
+    'LCA_Unit',
+    'Is_Input',
+    'Reference_Product',
+    'UUID',
+    'Category',
+    'Category_Key',
+])
+'''namedtuple : The data frame columns read when creating an exchange.'''
+
+_REFERENCE_KEY = 'reference product'
+'''str : Handler key for the reference product rows.'''
 
 
 
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
-def create_new_process(client, df, process_name, process_description):
+def create_new_process(client,
+                       df,
+                       process_name,
+                       process_description,
+                       ref_flow_mode=None,
+                       interactive=True,
+                       use_exchange_cache=False):
     """Create a new process in openLCA.
 
+    Progress messages (including the flow each interactive search prompt is
+    about) are printed; errors and warnings go through the module logger.
+
     Parameters
     ----------
     client : NetlOlca
@@ -64,6 +98,20 @@ def create_new_process(client, df, process_name, process_description):
         Process name.
     process_description : str
         Process description.
+    ref_flow_mode : str, optional
+        How to create the reference product exchange, either 'existing' or
+        'new' (see :func:`create_exchange_ref_flow`). Defaults to None, which
+        asks the user.
+    interactive : bool, optional
+        Whether to ask the user to try again when an exchange cannot be
+        created. Defaults to True; if False, the error is logged and the row
+        is skipped. Rows whose exchange could not be created are listed in a
+        warning either way.
+    use_exchange_cache : bool, optional
+        Whether to read (and write) a cached exchange database (see
+        :func:`get_exchange_database`). Defaults to False, which rebuilds it
+        without touching the disk; only set it if no processes were edited in
+        openLCA since the cache was written.
 
     Returns
     -------
@@ -87,163 +135,71 @@ def create_new_process(client, df, process_name, process_description):
 
     # 3. Create exchange database
     print('Creating exchange database, this may take a couple minutes...')
-    exchange_database = create_exchange_database(client)
+    exchange_database = index_exchanges(
+        get_exchange_database(client, use_cache=use_exchange_cache))
 
-    # 4. Create exchanges
-    exchanges = []
-    parameters = []
-    parameters_table = pd.DataFrame(columns=['parameter_name', 'parameter_description', 'parameter_value'])
-    count = 0
+    # Query all known flows (e.g., elementary flows) once, up front, rather
+    # than one IPC round-trip per exchange. The cache is cleared first, so
+    # flows edited in openLCA since the last run are not served stale.
+    clear_flow_cache()
+    prefetch_flows(client, df['UUID'])
 
-    # Loop through the dataframe, find reference product, and create exchanges
-    for _, row in df.iterrows():
-        count+=1
-        # Gives you the option to try again if you make a mistake
-        while True:
+    # 4. Create exchanges
+    # One process parameter per row (p1, p2, ...); each exchange uses its
+    # parameter name as the amount formula.
+    parameters = [
+        create_parameter(f"p{i}", f"Reference parameter for {product}", '', True, _PROCESS_SCOPE, amount)
+        for i, (product, amount) in enumerate(
+            zip(df['Flow_Name'].tolist(), df['LCA_Amount'].tolist()), 1
+        )
+    ]
+    # Exchange handlers, by (lower case) flow category
+    handlers = {
+        _REFERENCE_KEY: partial(_handle_reference_flow, ref_flow_mode=ref_flow_mode),
+        'elementary flows': _handle_elementary_flow,
+        'product flows': partial(_handle_provider_flow, flow_type_str='product'),
+        'technosphere flows': partial(_handle_provider_flow, flow_type_str='product'),
+        'waste flows': partial(_handle_provider_flow, flow_type_str='waste'),
+    }
+
+    # Create the exchanges one group of rows (i.e., handler) at a time,
+    # starting with the reference product; results keep the data frame order.
+    rows = list(_iter_rows(df))
+    results = [None] * len(rows)
+    failed = []
+    for key, positions in _group_rows(df):
+        handler = handlers.get(key, _handle_invalid_category)
+        for i in positions:
+            args = (client, rows[i], parameters[i], exchange_database)
             try:
-                product = row['Flow_Name']
-                unit = row['LCA_Unit']
-                amount = row['LCA_Amount']
-                is_input = row['Is_Input']
-                flow_uuid = row['UUID']
-                parameter = create_parameter(f"p{count}", f"Reference parameter for {product}",'', True, ParameterScope("PROCESS_SCOPE"), amount)
-                parameters.append(parameter)                
-                # TODO: add a check to see if there is more than one reference
-                # product. Just want to have a warning printed.
-                if row['Reference_Product']:
-                    print("\n")
-                    print(f"Creating exchange for reference product: {product}")
-                    print("----------------------------------------")
-                    exchange = create_exchange_ref_flow(client, product, amount, parameter.name, unit, is_input, row['Reference_Product'])
-                    exchanges.append(exchange)
-                    parameters_table.loc[count-1, ('parameter_name', 'parameter_description', 'parameter_value')] = (f"p{count}", product, amount)
-                    # If reference flow, then we don't need to search for a
-                    # process.
-                    break
-                else:
-                    # If not elementary flow, the we need to identify flow
-                    # category, search for a flow and process/provider to
-                    # create an exchange.
-                    if row['Category'].lower() == 'elementary flows':
-                        print("\n")
-                        print(f"Creating exchange for elementary flow: {product}")
-                        print("--------------------------------------")
-                        try:
-                            exchange = create_exchange_elementary_flow(
-                                client, flow_uuid, unit, amount, parameter.name, is_input
-                            )
-                            print(
-                                "Exchange created for elementary flow: "
-                                f"{product}"
-                            )
-                            exchanges.append(exchange)
-                            parameters_table.loc[count-1, ('parameter_name', 'parameter_description', 'parameter_value')] = (f"p{count}", product, amount)
-                            break
-                        except Exception as e:
-                            print(
-                                "Error creating exchange for elementary "
-                                f"flow: {e}"
-                            )
-                            break
-
-                    # If product flow, then we need to search for a process
-                    elif (row['Category'].lower() == 'technosphere flows'
-                            or row['Category'].lower() == 'product flows'):
-                        print("\n")
-                        print(f"Creating exchange for product flow: {product}")
-                        print("-----------------------------------")
-                        flow_uuid, provider_uuid = search_and_select(
-                            exchanges_df=exchange_database,
-                            keywords=product,
-                            flow_type_str='product',
-                            client=client,
-                            unit=unit
-                        )
-                        # Allows user to skip the flow
-                        if flow_uuid == 'skip':
-                            print(f"Skipping flow: {product}")
-                            break
-                        try:
-                            exchange = create_exchange_pr_wa_flow(
-                                client,
-                                flow_uuid,
-                                provider_uuid,
-                                amount,
-                                parameter.name,
-                                unit,
-                                is_input
-                            )
-                            print(
-                                "Exchange created for product "
-                                f"flow: {product}"
-                            )
-                            exchanges.append(exchange)
-                            parameters_table.loc[count-1, ('parameter_name', 'parameter_description', 'parameter_value')] = (f"p{count}", product, amount)
-                            break
-                        except Exception as e:
-                            print(
-                                f"Error creating exchange for product flow: {e}"
-                            )
-                            break
-                        # If the flow is an technosphere flow, the we create an
-                        # exchange and move to the next row.
-
-                    # If waste flow, then we need to search for a process.
-                    elif row['Category'].lower() == 'waste flows':
-                        print("\n")
-                        print(f"Creating exchange for waste flow: {product}")
-                        print("---------------------------------")
-                        flow_uuid, provider_uuid = search_and_select(
-                            exchanges_df=exchange_database,
-                            keywords=product,
-                            flow_type_str='waste',
-                            client=client,
-                            unit=unit
-                        )
-                        # Allows user to skip the flow
-                        if flow_uuid == 'skip':
-                            print(f"Skipping flow: {product}")
-                            break
-                        try:
-                            exchange = create_exchange_pr_wa_flow(
-                                client,
-                                flow_uuid,
-                                provider_uuid,
-                                amount,
-                                parameter.name,
-                                unit,
-                                is_input
-                            )
-                            print(
-                                "Exchange created for waste "
-                                f"flow: {product}"
-                            )
-                            exchanges.append(exchange)
-                            parameters_table.loc[count-1, ('parameter_name', 'parameter_description', 'parameter_value')] = (f"p{count}", product, amount)
-                            break
-                        except Exception as e:
-                            print(
-                                f"Error creating exchange for waste flow: {e}"
-                            )
-                            break
-                    else:
-                        raise ValueError(
-                            f"Invalid category: {row['Category']}. "
-                            "Must be one of: elementary flows, product flows, "
-                            "technosphere flows, waste flows."
-                        )
+                results[i] = handler(*args)
             # Add handle errors if the row is missing a required column:
             # product, amount, unit, is_input, reference_product, and/or
             # category.
             except Exception as e:
-                print(f"Error creating exchange for flow: {e}")
-                retry_response = input(
-                    "Do you want to try again? (y/n): "
-                ).strip()
-                if retry_response.lower().startswith('y'):
-                    continue
-                elif retry_response.lower().startswith('n'):
-                    break
+                logger.error("Error creating exchange for flow: %s", e)
+                # Gives you the option to try again if you make a mistake
+                if interactive:
+                    results[i] = _retry_exchange(handler, *args)
+                if results[i] is None:
+                    failed.append(rows[i].Flow_Name)
+    if failed:
+        logger.warning(
+            "No exchange was created for %d flow(s): %s",
+            len(failed), ", ".join(map(str, failed)))
+
+    # None means the flow was skipped or its exchange failed
+    exchanges = []
+    param_rows = []
+    for row, parameter, exchange in zip(rows, parameters, results):
+        if exchange is not None:
+            exchanges.append(exchange)
+            param_rows.append((parameter.name, row.Flow_Name, row.LCA_Amount))
+
+    parameters_table = pd.DataFrame.from_records(
+        param_rows,
+        columns=['parameter_name', 'parameter_description', 'parameter_value']
+    )
 
     # 5. Create process
     process.parameters = parameters
@@ -252,10 +208,145 @@ def create_new_process(client, df, process_name, process_description):
     # 6. Save process to openLCA
     created_process = client.client.put(process)
     print(f"Successfully created process: {process_name}")
-    print(f"Process saved successfully to openLCA database!")
+    print("Process saved successfully to openLCA database!")
     return created_process, parameters_table
 
 
+def _iter_rows(df):
+    """Helper function to iterate over the data frame rows as _ExchangeRow
+    tuples.
+
+    Only the columns in _ExchangeRow are read, as plain Python lists, which
+    avoids building a namedtuple class (and tuple fields) for every column of
+    a wide data frame. Missing optional columns (e.g., Category) read as None.
+    """
+    n = len(df)
+    columns = [
+        df[c].tolist() if c in df.columns else [None] * n
+        for c in _ExchangeRow._fields
+    ]
+    return map(_ExchangeRow._make, zip(*columns))
+
+
+def _group_rows(df):
+    """Helper function to group the data frame row positions by handler key.
+
+    Returns a list of (key, positions) tuples, where the key is _REFERENCE_KEY
+    for reference products and the lower case category otherwise. Reference
+    products come first; other groups are in order of first appearance.
+    """
+    if 'Category_Key' in df.columns:
+        keys = df['Category_Key'].reset_index(drop=True)
+    else:
+        keys = pd.Series('', index=range(len(df)))
+    keys = keys.where(~df['Reference_Product'].to_numpy(), _REFERENCE_KEY)
+    groups = keys.groupby(keys, sort=False).indices
+    return sorted(groups.items(), key=lambda x: x[0] != _REFERENCE_KEY)
+
+
+def _retry_exchange(handler, *args):
+    """Helper function to ask the user to try creating an exchange again.
+
+    Takes an exchange handler and its arguments, and returns None if the user
+    gives up.
+    """
+    while True:
+        retry_response = input("Do you want to try again? (y/n): ").strip()
+        if retry_response.lower().startswith('y'):
+            try:
+                return handler(*args)
+            except Exception as e:
+                logger.error("Error creating exchange for flow: %s", e)
+        elif retry_response.lower().startswith('n'):
+            return None
+
+
+def _print_header(title, flow_name):
+    """Helper function to print the flow an exchange (and any interactive
+    prompt that follows) is about, underlined."""
+    print("\n")
+    print(f"{title}{flow_name}")
+    print("-" * (len(title) - 1))
+
+
+def _handle_reference_flow(client, row, parameter, exchange_database,
+                           ref_flow_mode):
+    """Helper function to create an exchange for the reference product."""
+    # TODO: add a check to see if there is more than one reference
+    # product. Just want to have a warning printed.
+    _print_header("Creating exchange for reference product: ", row.Flow_Name)
+    return create_exchange_ref_flow(client, row.Flow_Name, row.LCA_Amount, parameter.name, row.LCA_Unit, row.Is_Input, row.Reference_Product, mode=ref_flow_mode)
+
+
+def _handle_elementary_flow(client, row, parameter, exchange_database):
+    """Helper function to create an exchange for an elementary flow.
+
+    Returns None if the exchange could not be created.
+    """
+    _print_header("Creating exchange for elementary flow: ", row.Flow_Name)
+    try:
+        exchange = create_exchange_elementary_flow(
+            client,
+            row.UUID,
+            row.LCA_Unit,
+            row.LCA_Amount,
+            parameter.name,
+            row.Is_Input
+        )
+    except Exception as e:
+        logger.error("Error creating exchange for elementary flow: %s", e)
+        return None
+    print(f"Exchange created for elementary flow: {row.Flow_Name}")
+    return exchange
+
+
+def _handle_provider_flow(client, row, parameter, exchange_database,
+                          flow_type_str):
+    """Helper function to create an exchange for a product or waste flow,
+    searching for a flow and its process/provider.
+
+    Returns None if the user skips the flow or the exchange could not be
+    created.
+    """
+    _print_header(f"Creating exchange for {flow_type_str} flow: ", row.Flow_Name)
+    flow_uuid, provider_uuid = search_and_select(
+        exchanges_df=exchange_database,
+        keywords=row.Flow_Name,
+        flow_type_str=flow_type_str,
+        client=client,
+        unit=row.LCA_Unit
+    )
+    # Allows user to skip the flow
+    if flow_uuid == 'skip':
+        print(f"Skipping flow: {row.Flow_Name}")
+        return None
+    try:
+        exchange = create_exchange_pr_wa_flow(
+            client,
+            flow_uuid,
+            provider_uuid,
+            row.LCA_Amount,
+            parameter.name,
+            row.LCA_Unit,
+            row.Is_Input
+        )
+    except Exception as e:
+        logger.error(
+            "Error creating exchange for %s flow: %s", flow_type_str, e)
+        return None
+    print(f"Exchange created for {flow_type_str} flow: {row.Flow_Name}")
+    return exchange
+
+
+def _handle_invalid_category(client, row, parameter, exchange_database):
+    """Helper function to reject a flow with an unknown category."""
+    raise ValueError(
+        f"Invalid category: {row.Category}. "
+        "Must be one of: elementary flows, product flows, "
+        "technosphere flows, waste flows."
+    )
+
+
 def read_dataframe(df):
     """Helper function to read data frame and review its structure."""
     # Read dataframe - handle both file path and DataFrame object
@@ -282,11 +373,31 @@ def read_dataframe(df):
         'Reference_Product',
         'Flow_Type'
     ]
-    if not all(col in df.columns for col in required_columns):
+    missing = set(required_columns).difference(df.columns)
+    if missing:
         raise ValueError(
             "The dataframe must have the following "
-            f"columns: {required_columns}"
+            f"columns: {required_columns}; missing: {sorted(missing)}"
         )
+
+    # Put the required columns first, followed by any others
+    required = set(required_columns)
+    df = df.loc[
+        :, required_columns + [c for c in df.columns if c not in required]
+    ]
+
+    # Coerce the flag columns to plain bools (missing values are False), so
+    # the exchange loop never tests the truth value of a NaN.
+    df = df.assign(
+        Is_Input=df['Is_Input'].fillna(False).astype(bool),
+        Reference_Product=df['Reference_Product'].fillna(False).astype(bool),
+    )
+
+    # Lower case the flow category once, rather than once per comparison in
+    # the exchange loop.
+    if 'Category' in df.columns:
+        df = df.assign(Category_Key=df['Category'].astype(str).str.lower())
+
     return df
 
 
@@ -299,29 +410,12 @@ def create_empty_process(client, process_name, process_description):
         description=process_description,
         process_type=olca.ProcessType.UNIT_PROCESS,
         version="1.0.0",
-        last_change=datetime.datetime.now().isoformat()
+        last_change=datetime.datetime.now().isoformat(timespec="seconds")
     )
 
     return process
 
 
-def generate_id(prefix: str = "entity") -> str:
-    """
-    Generate a unique ID for openLCA entities.
-
-    Parameters
-    ----------
-    prefix : str
-        Prefix for the ID (e.g., 'process', 'flow', 'unit').
-        Note: prefix is ignored to comply with database VARCHAR(36) limit
-
-    Returns
-    -------
-    str
-        Unique ID (36-character UUID string).
-    """
-    return str(uuid.uuid4())
-
 def create_parameter(
     name, 
     description, 
@@ -349,6 +443,12 @@ def create_parameter(
         Options: 'PROCESS_SCOPE', 'IMPACT_SCOPE', 'GLOBAL_SCOPE'
     value : float
         The value of the parameter.
+
+    Notes
+    -----
+    olca.Parameter is a plain dataclass (no validation or __post_init__), so
+    construction costs one object per row; parameters are built once, before
+    the exchange loop.
     """ 
     parameter = olca.Parameter(
         name = name,
@@ -366,7 +466,7 @@ def create_parameter(
 
 if __name__ == "__main__":
     
-    sample_df = pd.read_csv("/home/franc/lca-prommis-francis/src/create_olca_process/lca_df_finalized.csv")
+    sample_df = read_dataframe("/home/franc/lca-prommis-francis/src/create_olca_process/lca_df_finalized.csv")
     
     netl = NetlOlca()
     netl.connect()
@@ -381,25 +481,25 @@ if __name__ == "__main__":
     exchanges = []
     parameters = []
     count = 0
-    for _, row in sample_df.iterrows():
+    for row in sample_df.itertuples(index=False):
         count+=1
         # Gives you the option to try again if you make a mistake
         while True:
             try:
-                product = row['Flow_Name']
-                unit = row['LCA_Unit']
-                amount = row['LCA_Amount']
-                is_input = row['Is_Input']
-                flow_uuid = row['UUID']
-                parameter = create_parameter(f"p{count}", f"Reference parameter for {product}",'', True, ParameterScope("PROCESS_SCOPE"), amount)
+                product = row.Flow_Name
+                unit = row.LCA_Unit
+                amount = row.LCA_Amount
+                is_input = row.Is_Input
+                flow_uuid = row.UUID
+                parameter = create_parameter(f"p{count}", f"Reference parameter for {product}",'', True, _PROCESS_SCOPE, amount)
                 parameters.append(parameter)
                 # TODO: add a check to see if there is more than one reference
                 # product. Just want to have a warning printed.
-                if row['Reference_Product']:    
+                if row.Reference_Product:    
                     print("\n")
                     print(f"Creating exchange for reference product: {product}")
                     print("----------------------------------------")
-                    exchange = create_exchange_ref_flow(netl, product, amount, parameter.name, unit, is_input, row['Reference_Product'])
+                    exchange = create_exchange_ref_flow(netl, product, amount, parameter.name, unit, is_input, row.Reference_Product)
                     exchanges.append(exchange)
                     # If reference flow, then we don't need to search for a
                     # process.
@@ -408,7 +508,7 @@ if __name__ == "__main__":
                     # If not elementary flow, the we need to identify flow
                     # category, search for a flow and process/provider to
                     # create an exchange.
-                    if row['Category'].lower() == 'elementary flows':
+                    if row.Category_Key == 'elementary flows':
                         print("\n")
                         print(f"Creating exchange for elementary flow: {product}")
                         print("--------------------------------------")
@@ -429,8 +529,8 @@ if __name__ == "__main__":
                             )
                             break
                     # If product flow, then we need to search for a process
-                    elif (row['Category'].lower() == 'technosphere flows'
-                            or row['Category'].lower() == 'product flows'):
+                    elif (row.Category_Key == 'technosphere flows'
+                            or row.Category_Key == 'product flows'):
                         print("\n")
                         print(f"Creating exchange for product flow: {product}")
                         print("-----------------------------------")
@@ -467,7 +567,7 @@ if __name__ == "__main__":
                             )
                             break
                     # If waste flow, then we need to search for a process.
-                    elif row['Category'].lower() == 'waste flows':
+                    elif row.Category_Key == 'waste flows':
                         print("\n")
                         print(f"Creating exchange for waste flow: {product}")
                         print("---------------------------------")
@@ -505,7 +605,7 @@ if __name__ == "__main__":
                             break
                     else:
                         raise ValueError(
-                            f"Invalid category: {row['Category']}. "
+                            f"Invalid category: {row.Category}. "
                             "Must be one of: elementary flows, product flows, "
                             "technosphere flows, waste flows."
                         )
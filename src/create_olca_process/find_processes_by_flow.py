@@ -44,9 +44,14 @@ The function then:
 1.  Filters rows from the database that have a flow uuid that matches the
     flow_uuid.
 2.  Return the process uuid column.
+
+When the same database is searched many times (e.g., once per flow when
+creating a process), index it once with :func:`index_exchanges`; the filter
+then becomes a sorted index look-up instead of a scan of every row.
 """
 __all__ = [
     "find_processes_by_flow",
+    "index_exchanges",
 ]
 
 
@@ -69,6 +74,12 @@ def find_processes_by_flow(exchanges_df, flow_uuid: str):
     pandas.DataFrame
         A reduced data frame where rows contain the flow UUID in the exchanges.
     """
+    # Indexed by exchange_uuid (see index_exchanges), use a label slice
+    if (isinstance(exchanges_df, pd.DataFrame)
+            and exchanges_df.index.name == 'exchange_uuid'
+            and exchanges_df.index.is_monotonic_increasing):
+        return exchanges_df.loc[flow_uuid:flow_uuid].reset_index(drop=True)
+
     # Dataframe containing exchanges
     df = pd.DataFrame(exchanges_df)
 
@@ -77,3 +88,26 @@ def find_processes_by_flow(exchanges_df, flow_uuid: str):
     df.drop(df[df['exchange_uuid'] != flow_uuid].index, inplace=True)
 
     return df
+
+
+def index_exchanges(exchanges_df):
+    """Index a data frame of exchange flows by flow UUID for repeated use with
+    :func:`find_processes_by_flow`.
+
+    Parameters
+    ----------
+    exchanges_df : pandas.DataFrame
+        A data frame of exchange flows (see create_exchange_database).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The same rows, indexed and sorted by 'exchange_uuid' (the column is
+        kept). A data frame without an 'exchange_uuid' column is returned as
+        is.
+    """
+    if 'exchange_uuid' not in exchanges_df.columns:
+        return exchanges_df
+    return exchanges_df.set_index(
+        'exchange_uuid', drop=False
+    ).rename_axis('exchange_uuid').sort_index(kind='stable')
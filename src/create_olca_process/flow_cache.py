@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# flow_cache.py
+#
+###############################################################################
+# DEPENDENCIES
+###############################################################################
+from concurrent.futures import ThreadPoolExecutor
+
+import olca_schema as olca
+
+
+###############################################################################
+# DOCUMENTATION
+###############################################################################
+__doc__ = """
+This module keeps an in-memory cache of openLCA flows, keyed by their
+universally unique identifiers (UUIDs), so that each flow is only queried once
+over IPC while exchanges are being created.
+
+**Assumptions**
+
+-   The user has openLCA running with an open database.
+-   The user is connected to the openLCA database through IPC.
+-   Flows are not modified in openLCA by another client while the cache is in
+    use. Call :func:`clear_flow_cache` to start fresh.
+
+**Logic**
+
+1.  :func:`prefetch_flows` queries a batch of flow UUIDs before the exchange
+    loop starts.
+2.  :func:`get_flow` returns a cached flow, or queries and caches it on a miss.
+3.  :func:`invalidate_flow` drops a flow after it is written to openLCA.
+"""
+__all__ = [
+    "clear_flow_cache",
+    "get_flow",
+    "invalidate_flow",
+    "prefetch_flows",
+]
+
+
+###############################################################################
+# GLOBALS
+###############################################################################
+_flow_cache = {}
+'''dict : Maps flow UUIDs to olca.Flow objects.'''
+
+
+###############################################################################
+# FUNCTIONS
+###############################################################################
+def get_flow(client, flow_uuid):
+    """Return the flow for a given UUID, querying openLCA on a cache miss.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        An instance of NetlOlca class.
+    flow_uuid : str
+        Flow universally unique identifier.
+
+    Returns
+    -------
+    olca.Flow or NoneType
+        The flow object, or None if it is not found in the database.
+        Missing flows are not cached.
+    """
+    flow = _flow_cache.get(flow_uuid)
+    if flow is None:
+        flow = client.query(olca.Flow, flow_uuid)
+        if flow is not None:
+            _flow_cache[flow_uuid] = flow
+    return flow
+
+
+def prefetch_flows(client, uuids, max_workers=8):
+    """Query and cache all flows in a collection of UUIDs.
+
+    Blank values (e.g., empty strings or NaNs from a data frame column) and
+    flows that are already cached are skipped. The remaining IPC queries are
+    overlapped on a thread pool. A failed query is not cached, so the error
+    surfaces when that flow is queried again (e.g., by its exchange).
+
+    Parameters
+    ----------
+    client : NetlOlca
+        An instance of NetlOlca class.
+    uuids : iterable
+        Flow universally unique identifiers.
+    max_workers : int, optional
+        The number of threads used to query openLCA. Defaults to 8.
+
+    Returns
+    -------
+    int
+        The number of flows held in the cache.
+    """
+    missing = [
+        x for x in set(uuids)
+        if isinstance(x, str) and x and x not in _flow_cache
+    ]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(lambda x: _try_get_flow(client, x), missing))
+    return len(_flow_cache)
+
+
+def _try_get_flow(client, flow_uuid):
+    """Helper function to query a flow, returning None on an error."""
+    try:
+        return get_flow(client, flow_uuid)
+    except Exception:
+        return None
+
+
+def invalidate_flow(flow_uuid):
+    """Remove a flow from the cache (e.g., after it was written to openLCA)."""
+    _flow_cache.pop(flow_uuid, None)
+
+
+def clear_flow_cache():
+    """Remove all flows from the cache."""
+    _flow_cache.clear()
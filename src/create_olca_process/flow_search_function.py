@@ -13,6 +13,8 @@ from typing import Optional
 import olca_schema as olca
 import pandas as pd
 
+from src.create_olca_process.flow_cache import get_flow
+
 
 ###############################################################################
 # DOCUMENTATION
@@ -122,7 +124,7 @@ def search_Flows_by_keywords(client,
         matching_flows = []
         for descriptor in matching_descriptors:
             try:
-                flow = client.query(olca.Flow, descriptor.id)
+                flow = get_flow(client, descriptor.id)
                 if flow:
                     # Filter by flow type if specified
                     if flow_type is None or flow.flow_type == flow_type:
@@ -16,12 +16,13 @@ except Exception as e:
     # Don't hard crash on import when reading the file; surface a clearer error
     # later when used.
     olca = None
-import olca_schema.units as o_units
 
 from netlolca import NetlOlca
 from src.create_olca_process.flow_search_function import search_Flows_by_keywords
 from src.create_olca_process.find_processes_by_flow import find_processes_by_flow
 from src.create_olca_process.create_exchange_database import create_exchange_database
+from src.create_olca_process.flow_cache import get_flow
+from src.create_olca_process.unit_lookup import property_ref_cached
 
 
 ###############################################################################
@@ -232,11 +233,9 @@ def search_and_select(exchanges_df,
     if selected_flow_uuid is None:
         return (None, None)
 
-    ids=[]
-    flow = client.query(olca.Flow, selected_flow_uuid)
-    flow_property = o_units.property_ref(unit)
-    if flow_property is None:
-        flow_property = o_units.property_ref(unit.lower())
+    # The flow is cached for the exchange that is created from it next
+    flow = get_flow(client, selected_flow_uuid)
+    flow_property = property_ref_cached(unit)
     if flow_property is None:
         raise ValueError(
             "The flow property is not found in the flow. "
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# unit_lookup.py
+#
+###############################################################################
+# DEPENDENCIES
+###############################################################################
+import functools
+
+import olca_schema as olca
+import olca_schema.units as o_units
+
+
+###############################################################################
+# DOCUMENTATION
+###############################################################################
+__doc__ = """
+This module includes memoized wrappers around the olca_schema.units reference
+look-ups.
+
+**Logic**
+
+PrOMMiS results reuse a small set of unit names (e.g., kg, m3, kWh, MJ), so each
+unit name is normalized once to the name known by olca_schema (trying the name
+as given, then its lower case form, e.g., 'KG' to 'kg'), and the unit and flow
+property references are resolved once per unit name.
+
+Only the (id, name) pair of each reference is cached; every call returns a new
+olca.Ref, so exchanges never share (and cannot mutate) the same object.
+"""
+__all__ = [
+    "canonical_unit",
+    "property_ref_cached",
+    "unit_ref_cached",
+]
+
+
+###############################################################################
+# FUNCTIONS
+###############################################################################
+@functools.lru_cache(maxsize=256)
+def canonical_unit(unit):
+    """Return the unit name as known by olca_schema.
+
+    Parameters
+    ----------
+    unit : str
+        Unit name.
+
+    Returns
+    -------
+    str
+        The unit name as given if it is known, else its lower case form.
+    """
+    if o_units.unit_ref(unit) is None:
+        return unit.lower()
+    return unit
+
+
+def property_ref_cached(unit):
+    """Return the reference flow property for a unit name.
+
+    Parameters
+    ----------
+    unit : str
+        Unit name.
+
+    Returns
+    -------
+    olca.Ref or NoneType
+        A reference to the flow property, or None if the unit is unknown.
+    """
+    return _new_ref(olca.RefType.FlowProperty, _property_key(unit))
+
+
+def unit_ref_cached(unit):
+    """Return the unit reference for a unit name.
+
+    Parameters
+    ----------
+    unit : str
+        Unit name.
+
+    Returns
+    -------
+    olca.Ref or NoneType
+        A reference to the unit, or None if the unit is unknown.
+    """
+    return _new_ref(olca.RefType.Unit, _unit_key(unit))
+
+
+@functools.lru_cache(maxsize=256)
+def _property_key(unit):
+    """Helper function to return the (id, name) of a unit's flow property."""
+    return _ref_key(o_units.property_ref(canonical_unit(unit)))
+
+
+@functools.lru_cache(maxsize=256)
+def _unit_key(unit):
+    """Helper function to return the (id, name) of a unit."""
+    return _ref_key(o_units.unit_ref(canonical_unit(unit)))
+
+
+def _ref_key(ref):
+    """Helper function to return the (id, name) of a reference, or None."""
+    return None if ref is None else (ref.id, ref.name)
+
+
+def _new_ref(ref_type, key):
+    """Helper function to build a reference from an (id, name) pair."""
+    if key is None:
+        return None
+    return olca.Ref(id=key[0], name=key[1], ref_type=ref_type)
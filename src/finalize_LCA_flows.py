@@ -37,6 +37,7 @@ Main Functions:
 -   main(): Orchestrates the complete workflow for REO processing
 -   finalize_df(): Converts flows to functional units and standardizes format
 -   merge_flows(): Combines flows based on source or category
+-   merge_flows_batch(): Applies several merge_flows() steps in one pass
 -   convert_to_functional_unit(): Normalizes flows using reference flow scaling
 -   get_uuid(): Retrieves UUIDs for elementary flows
 -   merge_duplicate_flows(): Consolidates duplicate flow entries
@@ -64,6 +65,7 @@ __all__ = [
     "main",
     "merge_duplicate_flows",
     "merge_flows",
+    "merge_flows_batch",
     "validate_finalize_parameters",
     "validate_merge_parameters",
 ]
@@ -109,6 +111,46 @@ context_mapping = {
 }
 '''dict : For mapping elementary flow compartments to openLCA contexts'''
 
+REO_list = [
+    "Yttrium Oxide",
+    "Lanthanum Oxide",
+    "Cerium Oxide",
+    "Praseodymium Oxide",
+    "Neodymium Oxide",
+    "Samarium Oxide",
+    "Gadolinium Oxide",
+    "Dysprosium Oxide",
+]
+'''list : Rare earth oxides merged into the UKy REO feed flow.'''
+
+uky_merge_specs = [
+    # This 374 ppm value is directly calculated from the flowsheet. The
+    # original study actually used 357 ppm as the feed concentration.
+    dict(
+        merge_source='Solid Feed',
+        new_flow_name='374 ppm REO Feed',
+        value_2_merge=REO_list
+    ),
+    dict(
+        merge_source='Roaster Product',
+        new_flow_name='73.4% REO Product'
+    ),
+    # Note: some of these streams are organic waste, but they're treated as
+    # wastewater.
+    dict(
+        merge_source='Wastewater',
+        new_flow_name='Wastewater',
+        merge_column='Category'
+    ),
+    dict(
+        merge_source='Solid Waste',
+        new_flow_name='Solid Waste',
+        merge_column='Category'
+    ),
+]
+'''list : The UKy flow merges, as keyword arguments for merge_flows (see
+merge_flows_batch). Do not modify.'''
+
 
 ###############################################################################
 # FUNCTIONS
@@ -308,52 +350,8 @@ def main(reference_flow: str = '73.4% REO Product',
     """
     df = pd.read_csv('output/lca_df_converted.csv')
 
-    # Run the merge_flows function for the feed
-    REO_list = [
-        "Yttrium Oxide",
-        "Lanthanum Oxide",
-        "Cerium Oxide",
-        "Praseodymium Oxide",
-        "Neodymium Oxide",
-        "Samarium Oxide",
-        "Gadolinium Oxide",
-        "Dysprosium Oxide",
-    ]
-    df = merge_flows(
-        df,
-        merge_source='Solid Feed',
-        new_flow_name='374 ppm REO Feed',
-        value_2_merge=REO_list
-
-    )
-    # This 374 ppm value is directly calculated from the flowsheet. The
-    # original study actually used 357 ppm as the feed concentration.
-
-    # Run the merge_flows function for the product
-    df = merge_flows(
-        df,
-        merge_source='Roaster Product',
-        new_flow_name='73.4% REO Product'
-    )
-
-    # Run the merge_flows function for the liquid waste flows
-    df = merge_flows(
-        df,
-        merge_source='Wastewater',
-        new_flow_name='Wastewater',
-        merge_column='Category'
-    )
-
-    # Note: some of these streams are organic waste, but they're treated as
-    # wastewater.
-
-    # Run the merge_flows function for the solid waste flows
-    df = merge_flows(
-        df,
-        merge_source='Solid Waste',
-        new_flow_name='Solid Waste',
-        merge_column='Category'
-    )
+    # Merge the feed, product, liquid waste, and solid waste flows
+    df = merge_flows_batch(df, uky_merge_specs)
 
     # Run the finalize_df function.
     try:
@@ -624,6 +622,114 @@ def merge_flows(df: pd.DataFrame,
     return df_copy
 
 
+def merge_flows_batch(df: pd.DataFrame, specs: List[dict]) -> pd.DataFrame:
+    """
+    Apply a sequence of flow merges in a single pass.
+
+    The result is the same as calling :func:`merge_flows` once per spec, in
+    order, but the DataFrame is converted to records once (rather than copied,
+    filtered, and rebuilt for every merge).
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Input DataFrame with flows to merge
+    specs : list of dict
+        Keyword arguments for each merge, in order (merge_source and
+        new_flow_name are required; the others use the same defaults as
+        merge_flows)
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame with all merges and deletions applied
+
+    Notes
+    -----
+    Insert positions are row positions. merge_flows uses the index label of
+    the first matching flow, which only differs for a DataFrame without a
+    default (0 to n-1) index.
+    """
+    records = df.to_dict('records')
+    has_lca_amount = 'LCA Amount' in df.columns
+
+    for spec in specs:
+        merge_source = spec['merge_source']
+        merge_column = spec.get('merge_column', 'Source')
+        delete = spec.get('delete', "all")
+
+        # Positions of all flows with matching source
+        matching = [
+            i for i, r in enumerate(records) if r[merge_column] == merge_source
+        ]
+        if not matching:
+            print(
+                f"Warning: No flows found with {merge_column} "
+                f"'{merge_source}'"
+            )
+            continue
+
+        # Create new flow from the first matching flow
+        new_flow = dict(records[matching[0]])
+        new_flow['Flow'] = spec['new_flow_name']
+        merge_logic = {
+            'Value 1': spec.get('value_1_merge', "same"),
+            'Value 2': spec.get('value_2_merge', "same"),
+        }
+        if has_lca_amount:
+            merge_logic['LCA Amount'] = spec.get('LCA_amount_merge', "total")
+        for value_column, logic in merge_logic.items():
+            new_flow[value_column] = _merge_record_values(
+                records, matching, value_column, logic
+            )
+
+        # Delete flows and find where the new flow goes
+        if delete == "all":
+            deleted = set(matching)
+        elif isinstance(delete, list):
+            deleted = {i for i in matching if records[i]['Flow'] in delete}
+        else:
+            deleted = set()
+        # (as in merge_flows: the first matching flow's position, else the
+        # first remaining matching flow's original position, else the end)
+        remaining = [i for i in matching if i not in deleted]
+        if matching[0] not in deleted:
+            insert_index = matching[0]
+        elif remaining:
+            insert_index = remaining[0]
+        else:
+            insert_index = len(records) - len(deleted)
+        if deleted:
+            records = [r for i, r in enumerate(records) if i not in deleted]
+
+        records.insert(insert_index, new_flow)
+
+    return pd.DataFrame(records)
+
+
+def _merge_record_values(records: List[dict],
+                         matching: List[int],
+                         value_column: str,
+                         merge_logic: Union[str, List[str]]) -> float:
+    """
+    Helper function for merge_flows_batch; same logic as _merge_values, for
+    flow records at the matching positions.
+    """
+    if merge_logic == "total":
+        return pd.Series(
+            [records[i][value_column] for i in matching]
+        ).sum()
+    elif isinstance(merge_logic, list):
+        return pd.Series(
+            [records[i][value_column] for i in matching
+             if records[i]['Flow'] in merge_logic],
+            dtype=float
+        ).sum()
+    else:
+        # "same" (and the default): value from the first matching flow
+        return records[matching[0]][value_column]
+
+
 def convert_to_functional_unit(df: pd.DataFrame,
                               flow_name: str,
                               flow_source: str) -> pd.DataFrame:
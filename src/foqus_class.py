@@ -7,35 +7,112 @@
 # REQUIRED MODULES
 ##############################################################################
 import os
+import functools
+import hashlib
 import logging
-from pathlib import Path
+import pickle
+import importlib.util
+import inspect
+from importlib import metadata
 import json
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
-from netlolca.NetlOlca import NetlOlca
-import prommis.uky.uky_flowsheet as uky
-from pyomo.core.base.var import Var
 import foqus_lib.framework.graph.graph as gr
 import foqus_lib.framework.graph.nodeVars as nv
 from foqus_lib.framework.uq.Distribution import Distribution
 from foqus_lib.framework.session.session import session
 from foqus_lib.framework.optimizer.problem import objectiveFunction, inequalityConstraint
 import foqus_lib.framework.optimizer.NLopt as nlopt
-from pyomo.environ import value
 
 import src as lca_prommis
 
+##############################################################################
+# GLOBALS
+##############################################################################
+uky_cache_dir = os.path.join(lca_prommis.output_dir, "cache")
+'''str : Folder for the cached UKy variable names and exchange table.'''
+
+_NLOPT_DEFAULTS = {
+    "Solver": "BOBYQA",
+    "maxeval": 0,
+    "maxtime": 60,
+    "tolfunabs": 1e-9,
+    "tolfunrel": 1e-9,
+    "tolxabs": 1e-9,
+    "tolxrel": 1e-9,
+    "lower": 0,
+    "upper": 10
+}
+'''dict : Default NLopt solver options (see setup_nlopt_solver_options).'''
+
+_INPUT_SUFFIX = "_input"
+'''str : Suffix of a receiving node's input variable, appended to the name
+of the matching output variable.'''
+
+
+##############################################################################
+# DECORATORS
+##############################################################################
+def _requires_node(*arg_names):
+    """Decorator to check that the named arguments are FOQUS node objects.
+
+    Raises TypeError ("<name> must be a valid FOQUS node object") before the
+    decorated method runs. Argument positions are looked up once, when the
+    method is decorated.
+    """
+    def decorator(fn):
+        params = list(inspect.signature(fn).parameters)
+        positions = [(name, params.index(name)) for name in arg_names]
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            for name, i in positions:
+                node = args[i] if i < len(args) else kwargs.get(name)
+                if not isinstance(node, gr.Node):
+                    raise TypeError(
+                        f"{name} must be a valid FOQUS node object"
+                    )
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
 ##############################################################################
 # CLASSES
 ##############################################################################
 class NetlFoqus(object):
+    # Fixed attributes: no per-instance __dict__, and assigning to a
+    # read-only property (e.g., ndv or has_graph) raises AttributeError
+    __slots__ = (
+        "vars",
+        "_vars_set",
+        "dv",
+        "_dv_by_name",
+        "_exchanges",
+        "_amount_by_name",
+        "exchanges_vars",
+        "fs",
+        "prommis_node",
+        "olca_node",
+        "edge",
+        "logger",
+        "outVars",
+        "output_dir",
+        "model",
+    )
+
     # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
     # Class Initialization
     # ////////////////////////////////////////////////////////////////////////
     def __init__(self):
         """Initialize NetlFoqus class."""
         self.vars = []  # all variables
+        self._vars_set = set()  # all variable names, for membership tests
         self.dv = []    # user-defined decision variables
+        self._dv_by_name = {}  # decision variables by name (see self.dv)
         self.exchanges = pd.DataFrame()  # user-defined exchanges
         self.exchanges_vars = []  # variables of user-defined exchanges
         self.fs = None  # foqus flowsheet object
@@ -47,6 +124,7 @@ class NetlFoqus(object):
         self.output_dir = lca_prommis.setup_output_directory(
             lca_prommis.output_dir
             )
+        self.model = None  # UKy flowsheet model (see init_uky)
 
     # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
     # Class Property Definitions
@@ -54,16 +132,36 @@ class NetlFoqus(object):
     @property
     def dv_names(self):
         # Decision variable names
-        return [x.ipvname for x in self.dv]
+        return list(self._dv_by_name)
 
     @property
     def ndv(self):
-        # Non-decision variables
-        return [x for x in self.vars if x not in self.dv]
+        # Non-decision variables (self.vars holds names, so compare names)
+        return [x for x in self.vars if x not in self._dv_by_name]
 
-    @ndv.setter
-    def ndv(self, value):
-        raise AttributeError("ndv is a read-only property")
+    @property
+    def exchanges(self):
+        # User-defined exchanges
+        return self._exchanges
+
+    @exchanges.setter
+    def exchanges(self, value):
+        self._exchanges = value
+        # LCA amounts indexed by flow name, built once per exchanges table
+        # (the first row wins for duplicate names)
+        if {'Flow_Name', 'LCA_Amount'}.issubset(value.columns):
+            amounts = value.drop_duplicates('Flow_Name')
+            self._amount_by_name = pd.Series(
+                amounts['LCA_Amount'].to_numpy(dtype=float),
+                index=amounts['Flow_Name'].to_numpy()
+            )
+        else:
+            self._amount_by_name = pd.Series(dtype=float)
+
+    @property
+    def amount_by_name(self):
+        # LCA amounts (float) indexed by exchange flow name
+        return self._amount_by_name
 
     @property
     def has_graph(self):
@@ -73,10 +171,6 @@ class NetlFoqus(object):
         # create_session function changed to create_graph
         # new create_session function added
 
-    @has_graph.setter
-    def has_graph(self, value):
-        raise AttributeError("has_graph is a read-only property")
-
     # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
     # Class Function Definitions
     # ////////////////////////////////////////////////////////////////////////
@@ -92,16 +186,21 @@ class NetlFoqus(object):
         -------
         None
         """
-        if var_name not in self.vars:
+        # Known variable names first (a set look-up), then the model itself
+        # (e.g., for a variable of an indexed block)
+        if var_name not in self._vars_set and (
+                self.model is None
+                or self.model.find_component(var_name) is None):
             raise ValueError(
                 f"Variable {var_name} not found in flowsheet variables."
             )
-        if var_name in self.dv_names:
+        if var_name in self._dv_by_name:
             self.logger.warning(
                 f"Variable {var_name} is already a decision variable."
             )
         else:
             self.dv.append(nv.NodeVars(ipvname=var_name))
+            self._dv_by_name[var_name] = self.dv[-1]
 
 
     def add_edge(self, from_node, to_node):
@@ -187,11 +286,7 @@ class NetlFoqus(object):
         -------
         None
         """
-        for dv in self.dv:
-            if dv.ipvname == var_name:
-                dv.setMax(max_val)
-                return
-        raise ValueError(f"Decision variable {var_name} not found.")
+        self._get_dv(var_name).setMax(max_val)
 
     def set_dv_min(self, var_name, min_val):
         """Set the minimum value for a decision variable.
@@ -207,11 +302,7 @@ class NetlFoqus(object):
         -------
         None
         """
-        for dv in self.dv:
-            if dv.ipvname == var_name:
-                dv.setMin(min_val)
-                return
-        raise ValueError(f"Decision variable {var_name} not found.")
+        self._get_dv(var_name).setMin(min_val)
 
     def set_dv_value(self, var_name, value):
         """Set the value for a decision variable.
@@ -227,11 +318,7 @@ class NetlFoqus(object):
         -------
         None
         """
-        for dv in self.dv:
-            if dv.ipvname == var_name:
-                dv.setValue(value)
-                return
-        raise ValueError(f"Decision variable {var_name} not found.")
+        self._get_dv(var_name).setValue(value)
 
     def set_dv_dist(self, var_name, distribution):
         """Set the distribution for a decision variable.
@@ -258,16 +345,44 @@ class NetlFoqus(object):
             distribution = distribution.title()
         my_dist = Distribution(distribution)
 
-        for dv in self.dv:
-            if dv.ipvname == var_name:
-                dv.dist = my_dist
-                return
-        raise ValueError(f"Decision variable {var_name} not found.")
+        self._get_dv(var_name).dist = my_dist
 
-    def init_uky(self):
+    def _append_var(self, var_name):
+        """Add a variable name to self.vars and its membership set."""
+        self.vars.append(var_name)
+        self._vars_set.add(var_name)
+
+    def _extend_vars(self, var_names):
+        """Add variable names to self.vars and its membership set."""
+        self.vars.extend(var_names)
+        self._vars_set.update(var_names)
+
+    def _get_dv(self, var_name):
+        """Return the decision variable for a given name.
+
+        Throws
+        ------
+        ValueError
+            If the decision variable is not found.
+        """
+        dv = self._dv_by_name.get(var_name)
+        if dv is None:
+            raise ValueError(f"Decision variable {var_name} not found.")
+        return dv
+
+    def init_uky(self, build_model=True):
         """
         Initialize the UKy flowsheet.
 
+        Parameters
+        ----------
+        build_model : bool, optional
+            Whether the UKy flowsheet model is needed. If True, the solved
+            model is built, or loaded from a cache file. If False, the
+            variable names and exchange table may be read from a cache file
+            (see get_uky_vars_exchanges) and no model is returned.
+            Defaults to True.
+
         Throws
         ------
         TypeError
@@ -278,7 +393,7 @@ class NetlFoqus(object):
 
         Returns
         -------
-        the UKy flosheet model
+        the UKy flosheet model (None if not built)
         
         """
         # Creates a session with ProMMiS and openLCA nodes connected by an edge.
@@ -291,15 +406,18 @@ class NetlFoqus(object):
         self.edge = self.add_edge(self.prommis_node, self.olca_node)
 
         # Get UKy exchange table
-        my_vars, my_df, my_cm = get_uky_vars_exchanges()
+        my_vars, my_df, my_cm = get_uky_vars_exchanges(build_model=build_model)
+        self.model = my_cm
 
         self.vars = my_vars
+        self._vars_set = set(my_vars)
 
         # Add exchange variables names from exchange flow names:
         self.exchanges = my_df
 
         return my_cm
     
+    @_requires_node('node')
     def set_input_variables(self, node, var_name, var_value, var_min, var_max):
         """
         Set the input variables for a given node.
@@ -321,22 +439,21 @@ class NetlFoqus(object):
         -------
         The input variable object
         """
-        if not isinstance(node, gr.Node):
-            raise TypeError("node must be a valid FOQUS node object")
         var = nv.NodeVars(ipvname=var_name, dtype = float)
-        if var.ipvname not in self.vars:
-            self.vars.append(var.ipvname)
+        if var.ipvname not in self._vars_set:
+            self._append_var(var.ipvname)
         var.setValue(var_value)
         var.setMin(var_min)
         var.setMax(var_max)
         var.scaling = "Linear"
         if node is not None:
             node.inVars[var_name] = var
-        logging.info(
-            "Set input variable %s for node %s: value=%f" % (var_name, node.name, var_value)
+        self.logger.info(
+            "Set input variable %s for node %s: value=%f", var_name, node.name, var_value
         )
         return self.vars[-1]
 
+    @_requires_node('producing_node', 'receiving_node')
     def initialize_intermediate_variables(self, producing_node, receiving_node):
         """
         Initialize the intermediate variables.
@@ -352,36 +469,48 @@ class NetlFoqus(object):
         -------
         None
         """
-        exchanges_names = self.exchanges['Flow_Name'].tolist()
-        if not isinstance(producing_node, gr.Node):
-            raise TypeError("producing_node must be a valid FOQUS node object")
-        if not isinstance(receiving_node, gr.Node):
-            raise TypeError("receiving_node must be a valid FOQUS node object")
-        for var_name in exchanges_names:
-            self.vars.append(nv.NodeVars(opvname=var_name, dtype = float).opvname)
-            self.exchanges_vars.append(nv.NodeVars(opvname=var_name, dtype = float))
-            value = self.exchanges.loc[self.exchanges['Flow_Name'] == var_name, 'LCA_Amount'].values[0]
-            self.exchanges_vars[-1].setValue(value)
-            logging.info(
-                "Set output properties for %s: value=%f" % (var_name, value)
-            )
-            if producing_node is not None:
-                producing_node.outVars[var_name] = self.exchanges_vars[-1]
-            if producing_node.name not in self.outVars:
-                self.outVars[producing_node.name] = []
-            self.outVars[producing_node.name].append(var_name)
-
-        for var_name in exchanges_names:
-            input_var_name = var_name + "_input"
-            self.vars.append(nv.NodeVars(ipvname=input_var_name, dtype = float).ipvname)
-            self.exchanges_vars.append(nv.NodeVars(ipvname=input_var_name, dtype = float))
-            value = self.exchanges.loc[self.exchanges['Flow_Name'] == var_name, 'LCA_Amount'].values[0]
-            self.exchanges_vars[-1].setValue(value)
-            logging.info(
-                "Set input properties for %s: value=%f" % (input_var_name, value)
-            )
-            if receiving_node is not None:
-                receiving_node.inVars[input_var_name] = self.exchanges_vars[-1]
+        # Names are interned, since they are dict keys on both nodes and are
+        # looked up again when the nodes are connected
+        exchanges_names = [
+            sys.intern(var_name)
+            for var_name in self.exchanges['Flow_Name'].tolist()
+        ]
+        # Amount for each row (the first row's amount for duplicate names),
+        # mapped in one vectorized step and read as plain Python floats
+        exchanges_amounts = self.exchanges['Flow_Name'].map(
+            self.amount_by_name
+        ).tolist()
+        # Output variables (producing node) and the matching "_input"
+        # variables (receiving node), built and set in a single pass
+        input_names = []
+        out_vars = []
+        in_vars = []
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        for var_name, value in zip(exchanges_names, exchanges_amounts):
+            input_var_name = sys.intern(var_name + _INPUT_SUFFIX)
+            out_var = nv.NodeVars(opvname=var_name, dtype = float)
+            out_var.setValue(value)
+            in_var = nv.NodeVars(ipvname=input_var_name, dtype = float)
+            in_var.setValue(value)
+            input_names.append(input_var_name)
+            out_vars.append(out_var)
+            in_vars.append(in_var)
+            if log_info:
+                self.logger.info(
+                    "Set output properties for %s: value=%f", var_name, value
+                )
+                self.logger.info(
+                    "Set input properties for %s: value=%f",
+                    input_var_name, value
+                )
+
+        self._extend_vars(exchanges_names)
+        self._extend_vars(input_names)
+        self.exchanges_vars.extend(out_vars)
+        self.exchanges_vars.extend(in_vars)
+        producing_node.outVars.update(zip(exchanges_names, out_vars))
+        receiving_node.inVars.update(zip(input_names, in_vars))
+        self.outVars.setdefault(producing_node.name, []).extend(exchanges_names)
 
     def connect_intermediate_variables(self, node1, node2):
         """
@@ -399,13 +528,20 @@ class NetlFoqus(object):
         None
 
         """
+        log_info = self.logger.isEnabledFor(logging.INFO)
         for var_out in node1.outVars:
-            var_in = next(var for var in node2.inVars if var.startswith(var_out))
+            # Inputs are named "<output>_input" (see
+            # initialize_intermediate_variables); else, match by prefix
+            var_in = var_out + _INPUT_SUFFIX
+            if var_in not in node2.inVars:
+                var_in = next(
+                    var for var in node2.inVars if var.startswith(var_out)
+                )
             self.edge.addConnection(var_out, var_in)
-            logging.info(
-                "Connected %s to %s" % (var_out, var_in)
-            )
+            if log_info:
+                self.logger.info("Connected %s to %s", var_out, var_in)
     
+    @_requires_node('node')
     def initiate_output_variables(self, node, var_name, var_value):
         """
         Initiate an output variable for a given node.
@@ -423,22 +559,64 @@ class NetlFoqus(object):
         -------
         None
         """
-        if not isinstance(node, gr.Node):
-            raise TypeError("node must be a valid FOQUS node object")
         var = nv.NodeVars(opvname=var_name, dtype = float)
-        if var.opvname not in self.vars:
-            self.vars.append(var.opvname)
+        if var.opvname not in self._vars_set:
+            self._append_var(var.opvname)
         var.setValue(var_value)
         if node is not None:
             node.outVars[var_name] = var
         if node.name not in self.outVars:
             self.outVars[node.name] = []
         self.outVars[node.name].append(var.opvname)
-        logging.info(
-            "Initiated output variable %s for node %s: value=%f" % (var_name, node.name, var_value)
+        self.logger.info(
+            "Initiated output variable %s for node %s: value=%f", var_name, node.name, var_value
         )
         return self.vars[-1]
 
+    @_requires_node('node')
+    def initiate_output_variables_bulk(self, node, values):
+        """
+        Initiate several output variables for a given node at once.
+
+        Same as calling initiate_output_variables for each name and value,
+        but the variables are registered with one update per collection.
+
+        Parameters
+        ----------
+        node : gr.Node
+            The node to initiate the output variables for.
+        values : dict or iterable
+            The output variable names and values (a dict, or (name, value)
+            pairs).
+
+        Returns
+        -------
+        list
+            The output variable objects, in the same order as values.
+        """
+        if isinstance(values, dict):
+            values = values.items()
+        var_names = []
+        out_vars = []
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        for var_name, var_value in values:
+            var = nv.NodeVars(opvname=var_name, dtype = float)
+            var.setValue(var_value)
+            var_names.append(var_name)
+            out_vars.append(var)
+            if log_info:
+                self.logger.info(
+                    "Initiated output variable %s for node %s: value=%f",
+                    var_name, node.name, var_value
+                )
+        self._extend_vars(
+            dict.fromkeys(n for n in var_names if n not in self._vars_set)
+        )
+        node.outVars.update(zip(var_names, out_vars))
+        self.outVars.setdefault(node.name, []).extend(var_names)
+        return out_vars
+
+    @_requires_node('node')
     def define_node_script(self, node, script):
         """
         This function defines the script for a give node
@@ -454,14 +632,12 @@ class NetlFoqus(object):
         -------
         None
         """
-        if not isinstance(node, gr.Node):
-            raise TypeError("node must be a valid FOQUS node object")
-        
         node.pythonCode = script
-        logging.info(
-            "Defined script for node %s: script=%s" % (node.name, script)
+        self.logger.info(
+            "Defined script for node %s: script=%s", node.name, script
         )
 
+    @_requires_node('node')
     def set_node_scriptMode(self, node, script_mode):
         """
         Set the script mode for a given node.
@@ -481,16 +657,14 @@ class NetlFoqus(object):
         -------
         None
         """
-        if not isinstance(node, gr.Node):
-            raise TypeError("node must be a valid FOQUS node object")
-        
         if script_mode not in ['pre', 'total', 'post']:
             raise ValueError("script_mode must be either 'pre', 'total', or 'post'")
         node.scriptMode = script_mode
-        logging.info(
-            "Set script mode for node %s: script_mode=%s" % (node.name, script_mode)
+        self.logger.info(
+            "Set script mode for node %s: script_mode=%s", node.name, script_mode
         )
         
+    @_requires_node('node')
     def run_standalone_node_script(self, node):
         """
         Run the script for a given node.
@@ -502,16 +676,15 @@ class NetlFoqus(object):
         node : gr.Node
             The node to run the script for.
         """
-        if not isinstance(node, gr.Node):
-            raise TypeError("node must be a valid FOQUS node object")
         if node.pythonCode is None:
             raise ValueError("node has no script to run")
         
         node.runPython()
-        logging.info(
-            "Run script for node %s" % (node.name)
+        self.logger.info(
+            "Run script for node %s", node.name
         )
         
+    @_requires_node('node')
     def run_node_script (self, node):
         """
         Run the script for a given node.
@@ -528,14 +701,12 @@ class NetlFoqus(object):
         node : gr.Node
             The node to run the script for.
         """
-        if not isinstance(node, gr.Node):
-            raise TypeError("node must be a valid FOQUS node object")
         if node.pythonCode is None:
             raise ValueError("node has no script to run")
         
         node.runCalc()
-        logging.info(
-            "Run script for node %s with script mode %s" % (node.name, node.scriptMode)
+        self.logger.info(
+            "Run script for node %s with script mode %s", node.name, node.scriptMode
         )
 
     def create_session(self):
@@ -552,12 +723,12 @@ class NetlFoqus(object):
         foqus_wd = get_foqus_wd()
         if cwd != foqus_wd:
             os.chdir(foqus_wd)
-            logging.info(
-                "Changed working directory to %s" % foqus_wd
+            self.logger.info(
+                "Changed working directory to %s", foqus_wd
             )
         else:
-            logging.info(
-                "Working directory is already %s" % cwd
+            self.logger.info(
+                "Working directory is already %s", cwd
             )
          
         my_session = session(useCurrentWorkingDir=True)
@@ -597,7 +768,7 @@ class NetlFoqus(object):
                 )
                 return False
             
-            logging.info(f"Node script executed successfully for {node.name}")
+            self.logger.info("Node script executed successfully for %s", node.name)
             return True
             
         except Exception as e:
@@ -844,7 +1015,8 @@ class NetlFoqus(object):
         """
         This function setups the solver options 
         The user has the option to simply use the default solver options
-        or to specify the solver options manually
+        or to specify the solver options manually; options that are not
+        specified (None) keep their default values
         Parameters
         ----------
         use_defaults : bool
@@ -874,24 +1046,14 @@ class NetlFoqus(object):
             The problem object.
         """
 
-        if use_defaults:
-            problem.solverOptions[problem.solver] = {
-            "Solver": "BOBYQA",   
-            "maxeval": 0,       
-            "maxtime": 60,
-            "tolfunabs": 1e-9,    
-            "tolfunrel": 1e-9,
-            "tolxabs": 1e-9,
-            "tolxrel": 1e-9,
-            "lower": 0,         
-            "upper": 10    
-            }
-        else:
-            optim = nlopt.opt()
-            valid_v = optim.options["Solver"].validValues
-            if algorithm not in valid_v:
-                raise ValueError(f"Invalid algorithm: {algorithm}. Valid algorithms are: {valid_v}")
-            problem.solverOptions[problem.solver] = {
+        options = dict(_NLOPT_DEFAULTS)
+        if not use_defaults:
+            if algorithm is not None:
+                optim = nlopt.opt()
+                valid_v = optim.options["Solver"].validValues
+                if algorithm not in valid_v:
+                    raise ValueError(f"Invalid algorithm: {algorithm}. Valid algorithms are: {valid_v}")
+            user_options = {
                 "Solver": algorithm,
                 "maxeval": max_func_eval,
                 "maxtime": max_time,
@@ -902,6 +1064,10 @@ class NetlFoqus(object):
                 "lower": lower_bound,
                 "upper": upper_bound
             }
+            options.update(
+                (k, v) for k, v in user_options.items() if v is not None
+            )
+        problem.solverOptions[problem.solver] = options
 
         return problem
 
@@ -909,6 +1075,10 @@ class NetlFoqus(object):
         """
         This function runs the optimization with validation
 
+        Each run starts with a new run identifier and an empty cache of
+        trial models, so no flowsheet model of an earlier run (or session in
+        the same kernel) is reused by its trials.
+
         Parameters
         ----------
         problem : foqus_lib.framework.optimizer.problem
@@ -923,7 +1093,9 @@ class NetlFoqus(object):
         problem : foqus_lib.framework.optimizer.problem
             The problem object.
         """
-        
+        lca_prommis.trial_models.clear()
+        lca_prommis.trial_run_id = uuid.uuid4().hex
+
         my_solver = problem.run(session)
         my_solver.join()  # wait for results
         logging.info("Optimization completed")
@@ -935,14 +1107,10 @@ class NetlFoqus(object):
 ###############################################################################
 openlca_node_script = """
 # import dependencies
-from pathlib import Path
 import pandas as pd
-import olca_schema as olca
 import re
 import os
 
-from netlolca.NetlOlca import NetlOlca
-
 import src as lca_prommis
 
 output_dir = lca_prommis.setup_output_directory(
@@ -962,18 +1130,15 @@ existing = [
 ]
 new_col = f"parameter_value_{max(existing, default=0) + 1}"
 # update the parameters table with the new parameter values
-for count, row in params.iterrows():
-    desc = row['parameter_description']
-
-    matching_keys = []
-    for k in x.keys():
-        if k.startswith(desc):
-            matching_keys.append(k)
-
-    if matching_keys and x[matching_keys[0]] is not None:
-        params.at[count, new_col] = float(x[matching_keys[0]])
+# (the first input variable starting with each description; 0 if none)
+new_values = []
+for desc in params['parameter_description']:
+    key = next((k for k in x if k.startswith(desc)), None)
+    if key is not None and x[key] is not None:
+        new_values.append(float(x[key]))
     else:
-        params.at[count, new_col] = 0
+        new_values.append(0.0)
+params[new_col] = new_values
 
 # save/overwrite the updated parameters table to the output directory
 params.to_csv(my_parameters_path, index=False)
@@ -989,10 +1154,8 @@ ps_uuid = run_info.loc[run_info['item'] == 'ps_uuid', 'description'].values[0]
 impact_method_uuid = run_info.loc[run_info['item'] == 'impact_method_uuid', 'description'].values[0]
 parameter_set_name = run_info.loc[run_info['item'] == 'parameter_set_name', 'description'].values[0]
 
-# connect to openLCA
-netl = NetlOlca()
-netl.connect()
-netl.read()
+# connect to openLCA (the connection is reused between trials)
+netl = lca_prommis.get_olca_client()
 
 param_set_ref = lca_prommis.run_analysis.update_parameter ( netl, 
                                                             ps_uuid = ps_uuid,
@@ -1004,11 +1167,13 @@ result = lca_prommis.run_analysis.run_analysis (netl,
                                                 impact_method_uuid = impact_method_uuid, 
                                                 parameter_set = param_set_ref.parameters)
 result.wait_until_ready()
-total_impacts = lca_prommis.generate_total_results.generate_total_results(result)
+# the impacts file in the output directory is updated below
+total_impacts = lca_prommis.generate_total_results.generate_total_results(
+    result, save=False
+)
 
 # save the total impacts to the node outputs
-for _, row in total_impacts.iterrows():
-    f[row['name']] = row['amount']
+f.update(zip(total_impacts['name'], total_impacts['amount']))
 
 impacts_path = os.path.join(output_dir, "total_impacts.csv")
 if not os.path.exists(impacts_path):
@@ -1034,12 +1199,10 @@ import re
 import logging
 globals()["re"] = re
 import pandas as pd
-import olca_schema as olca
-from netlolca.NetlOlca import NetlOlca
 import prommis.uky.uky_flowsheet as uky
 import src as lca_prommis
 
-from pyomo.environ import TransformationFactory, value
+from pyomo.environ import value
 from idaes.core.util.model_diagnostics import DiagnosticsToolbox
 from idaes.core.util.model_statistics import degrees_of_freedom
 from prommis.uky.costing.ree_plant_capcost import QGESSCostingData
@@ -1050,9 +1213,17 @@ output_dir = lca_prommis.setup_output_directory(
             lca_prommis.output_dir
             )
 
-m = uky.build()
-
-uky.set_operating_conditions(m)
+# The flowsheet is built (with its operating conditions set) once per
+# optimization run, and each trial works on a clone of that unsolved model,
+# so every trial goes through the same steps and no state from an earlier
+# trial carries over (see NetlFoqus.run_optimization)
+model_key = ("uky", lca_prommis.trial_run_id)
+template = lca_prommis.trial_models.get(model_key)
+if template is None:
+    template = uky.build()
+    uky.set_operating_conditions(template)
+    lca_prommis.trial_models[model_key] = template
+m = template.clone()
 
 if "fs.leach_liquid_feed.flow_vol" in x:
     m.fs.leach_liquid_feed.flow_vol.fix(x["fs.leach_liquid_feed.flow_vol"])
@@ -1075,10 +1246,10 @@ existing = [
     if (n := re.match(r"value_(\\d+)", col))
 ]
 new_col = f"value_{max(existing, default=0) + 1}"
-for count, row in dv_df.iterrows():
-    dv_name = row['variable_name']
-    if dv_name in x:
-        dv_df.at[count, new_col] = x[dv_name]
+dv_df[new_col] = [
+    x[dv_name] if dv_name in x else float("nan")
+    for dv_name in dv_df['variable_name']
+]
 dv_df.to_csv(os.path.join(output_dir, "decision_variables.csv"), index = False)
 
 uky.set_scaling(m)
@@ -1126,24 +1297,7 @@ prommis_data = lca_prommis.data_lca.get_lca_df(m)
 
 df = lca_prommis.convert_lca.convert_flows_to_lca_units(prommis_data, hours=1, mol_to_kg=True, water_unit='m3')
 
-REO_list = [
-    "Yttrium Oxide",
-    "Lanthanum Oxide",
-    "Cerium Oxide",
-    "Praseodymium Oxide",
-    "Neodymium Oxide",
-    "Samarium Oxide",
-    "Gadolinium Oxide",
-    "Dysprosium Oxide",
-]
-
-df = lca_prommis.final_lca.merge_flows(df, merge_source='Solid Feed', new_flow_name='374 ppm REO Feed', value_2_merge=REO_list)
-
-df = lca_prommis.final_lca.merge_flows(df, merge_source='Roaster Product', new_flow_name='73.4% REO Product')
-
-df = lca_prommis.final_lca.merge_flows(df, merge_source='Wastewater', new_flow_name='Wastewater', merge_column='Category') 
-
-df = lca_prommis.final_lca.merge_flows(df, merge_source='Solid Waste', new_flow_name='Solid Waste', merge_column='Category') 
+df = lca_prommis.final_lca.merge_flows_batch(df, lca_prommis.final_lca.uky_merge_specs)
 
 finalized_df = lca_prommis.final_lca.finalize_df(
         df=df, 
@@ -1152,10 +1306,10 @@ finalized_df = lca_prommis.final_lca.finalize_df(
         water_type='raw fresh water'
     )
 
-finalized_df.to_csv(os.path.join(output_dir, "finalized_df.csv"), index=False)
+if lca_prommis.save_trial_exchanges:
+    finalized_df.to_csv(os.path.join(output_dir, "finalized_df.csv"), index=False)
 
-for _, row in finalized_df.iterrows():
-    f[row['Flow_Name']] = row['LCA_Amount']
+f.update(zip(finalized_df['Flow_Name'], finalized_df['LCA_Amount']))
 
 prommis_outputs = { "total plant cost": value(m.fs.costing.total_overnight_capital),
                     "total bare erected cost": value(m.fs.costing.total_BEC),
@@ -1182,30 +1336,68 @@ existing = [
     if (n := re.match(r"value_(\\d+)", col))
 ]
 new_col = f"value_{max(existing, default=0) + 1}"
-for count, row in prommis_outputs.iterrows():
-    output = row['output']
-    prommis_outputs.loc[count, new_col] = f[output] #new value for the output
+# new value for each output
+prommis_outputs[new_col] = [f[output] for output in prommis_outputs['output']]
 prommis_outputs.to_csv(os.path.join(output_dir, "prommis_outputs.csv"), index = False)
 """
 
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
-def get_uky_vars_exchanges():
+def get_uky_vars_exchanges(build_model=True, refresh=False):
     """Run the UKy flowsheet and process LCA data to create an initial
     exchange table.
 
+    Solving the flowsheet is slow, so the variable names and exchange table
+    are saved to a pickle file in ``uky_cache_dir``. The file name includes a
+    hash of the installed PrOMMiS, IDAES, and Pyomo versions, the UKy
+    flowsheet source, and the LCA conversion modules, so a new file is created
+    when any of them changes.
+    The solved model is also pickled to its own file, so later calls that
+    need the model load it instead of rebuilding and solving the flowsheet.
+    If the model can not be pickled (e.g., it holds external functions), it
+    is rebuilt on every call.
+
+    Parameters
+    ----------
+    build_model : bool, optional
+        Whether the flowsheet model is needed. If False and a cache file
+        exists, the flowsheet is not built or loaded and None is returned for
+        the model. Defaults to True.
+    refresh : bool, optional
+        Whether to ignore existing cache files. Defaults to False.
+
     Returns
     -------
-    pandas.DataFrame
+    tuple
+        The list of PrOMMiS variable names, the finalized exchange table
+        (pandas.DataFrame), and the UKy ConcreteModel (or None).
     """
+    cache_key = _uky_cache_key()
+    cache_path = os.path.join(uky_cache_dir, f"uky_{cache_key}.pkl")
+    model_path = os.path.join(uky_cache_dir, f"uky_model_{cache_key}.pkl")
+    if not refresh and os.path.isfile(cache_path):
+        if not build_model:
+            cached = _try_load_pickle(cache_path)
+            if cached is not None:
+                all_vars, finalized_df = cached
+                return (all_vars, _from_cached_df(finalized_df), None)
+        elif os.path.isfile(model_path):
+            cached = _try_load_pickle(cache_path)
+            m = _try_load_pickle(model_path) if cached is not None else None
+            if m is not None:
+                all_vars, finalized_df = cached
+                return (all_vars, _from_cached_df(finalized_df), m)
+
+    # Imported here, since importing the flowsheet pulls in IDAES and PrOMMiS
+    import prommis.uky.uky_flowsheet as uky
+    from pyomo.core.base.var import Var
+
     # Build the ConcreteModel from UKy flowsheet
     m, _ = uky.main()
 
     # Extract all potential PrOMMiS variables
-    all_vars = []
-    for my_var in m.component_objects(Var):
-        all_vars.append(my_var.name)
+    all_vars = [my_var.name for my_var in m.component_objects(Var)]
 
     # Create LCA exchanges (for PrOMMiS outputs to openLCA inputs)
     prommis_data = lca_prommis.data_lca.get_lca_df(m)
@@ -1217,42 +1409,8 @@ def get_uky_vars_exchanges():
         water_unit='m3'
     )
 
-    REO_list = [
-        "Yttrium Oxide",
-        "Lanthanum Oxide",
-        "Cerium Oxide",
-        "Praseodymium Oxide",
-        "Neodymium Oxide",
-        "Samarium Oxide",
-        "Gadolinium Oxide",
-        "Dysprosium Oxide",
-    ]
-
-    df = lca_prommis.final_lca.merge_flows(
-        df,
-        merge_source='Solid Feed',
-        new_flow_name='374 ppm REO Feed',
-        value_2_merge=REO_list
-    )
-
-    df = lca_prommis.final_lca.merge_flows(
-        df,
-        merge_source='Roaster Product',
-        new_flow_name='73.4% REO Product'
-    )
-
-    df = lca_prommis.final_lca.merge_flows(
-        df,
-        merge_source='Wastewater',
-        new_flow_name='Wastewater',
-        merge_column='Category'
-    )
-
-    df = lca_prommis.final_lca.merge_flows(
-        df,
-        merge_source='Solid Waste',
-        new_flow_name='Solid Waste',
-        merge_column='Category'
+    df = lca_prommis.final_lca.merge_flows_batch(
+        df, lca_prommis.final_lca.uky_merge_specs
     )
 
     finalized_df = lca_prommis.final_lca.finalize_df(
@@ -1261,8 +1419,102 @@ def get_uky_vars_exchanges():
         reference_source='Roaster Product',
         water_type='raw fresh water'
     )
+    # Cache writes are best-effort; a failure only means a rebuild next time
+    if _try_dump_pickle((all_vars, _to_cached_df(finalized_df)), cache_path):
+        _try_dump_pickle(m, model_path)
+
     return (all_vars, finalized_df, m)
 
+def _to_cached_df(df):
+    """Helper function to store the repeated text columns of an exchange
+    table as categoricals, which shrinks the cache file."""
+    return df.astype({'Flow_Name': 'category', 'Category': 'category'})
+
+def _from_cached_df(df):
+    """Helper function to restore the object columns of a cached exchange
+    table, so callers can assign new flow names and categories to rows."""
+    return df.astype({'Flow_Name': object, 'Category': object})
+
+def _load_pickle(file_path):
+    """Helper function to read a pickle file."""
+    with open(file_path, "rb") as f:
+        return pickle.load(f)
+
+def _try_load_pickle(file_path):
+    """Helper function to read a cache pickle file.
+
+    If the file can not be read (e.g., it is truncated, or it was written
+    with other versions of the IDAES/Pyomo plugins), the error is logged, the
+    file is deleted, and None is returned, so the caller rebuilds it.
+    """
+    try:
+        return _load_pickle(file_path)
+    except Exception as e:
+        logging.warning("Discarding unreadable cache file %s: %s", file_path, e)
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+        return None
+
+def _dump_pickle(obj, file_path):
+    """Helper function to write a pickle file.
+
+    Writes to a temporary file and renames it, so a partial file is never
+    read. The temporary file is removed if pickling fails.
+    """
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _try_dump_pickle(obj, file_path):
+    """Helper function to write a cache pickle file.
+
+    Any error (e.g., an object that can not be pickled, or a RecursionError
+    on a deep Pyomo model) is logged and False is returned; the temporary
+    file is removed by _dump_pickle.
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        _dump_pickle(obj, file_path)
+    except Exception as e:
+        logging.warning("Cache file %s not written: %s", file_path, e)
+        return False
+    return True
+
+def _uky_cache_key():
+    """Helper function to hash the package versions, the UKy flowsheet source,
+    and the LCA conversion code that the UKy exchange table depends on."""
+    digest = hashlib.sha1()
+    for package in ("prommis", "idaes-pse", "pyomo"):
+        try:
+            version = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            version = ""
+        digest.update(f"{package}={version};".encode("utf-8"))
+    # The flowsheet file is found without importing it (which is slow), and
+    # covers local edits to an editable PrOMMiS install
+    try:
+        uky_spec = importlib.util.find_spec("prommis.uky.uky_flowsheet")
+    except ModuleNotFoundError:
+        uky_spec = None
+    source_files = [
+        module.__file__ for module in (lca_prommis.data_lca,
+                                       lca_prommis.convert_lca,
+                                       lca_prommis.final_lca)
+    ]
+    if uky_spec is not None and uky_spec.origin:
+        source_files.append(uky_spec.origin)
+    for source_file in source_files:
+        with open(source_file, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
 def initiate_lca_model(client, 
                         process_name, 
                         process_description, 
@@ -1272,9 +1524,15 @@ def initiate_lca_model(client,
                         parameter_set_description, 
                         is_baseline,
                         save_outputs=False,
-                        output_dir = None):
+                        output_dir = None,
+                        refresh=False):
     """
     Initiate the LCA model.
+
+    The process and product system are created once per client, process
+    name, and exchange table; later calls with the same inputs only create
+    (or replace, by name) the parameter set and run the analysis.
+
     Parameters
     ----------
     client : olca_ipc.Client
@@ -1291,6 +1549,9 @@ def initiate_lca_model(client,
         Whether to save the outputs to the output directory.
     output_dir : str
         The directory to save the outputs.
+    refresh : bool, optional
+        Whether to create a new process and product system even if they were
+        already created for the same inputs. Defaults to False.
 
     Returns
     -------
@@ -1305,22 +1566,22 @@ def initiate_lca_model(client,
         if output_dir is None:
             raise ValueError("Please provide an output directory to save the outputs")
     
-    process, my_parameters = lca_prommis.create_lca.create_new_process(client,
-                                                                        lca_df_finalized,
-                                                                        process_name,
-                                                                        process_description)
-    ps = lca_prommis.create_ps.create_ps(client, process.id)
-    ps_uuid = ps.id
+    process_uuid, ps_uuid, my_parameters = _get_lca_model(client,
+                                                          process_name,
+                                                          process_description,
+                                                          lca_df_finalized,
+                                                          refresh)
     # create baseline parameter set
     parameter_set = lca_prommis.run_analysis.create_parameter_set(client, 
-                                                                process.id, 
-                                                                ps.id, 
+                                                                process_uuid, 
+                                                                ps_uuid, 
                                                                 parameter_set_name, 
                                                                 parameter_set_description, 
-                                                                is_baseline)
+                                                                is_baseline,
+                                                                replace=True)
     
     result = lca_prommis.run_analysis.run_analysis(client, 
-                                                    ps.id, 
+                                                    ps_uuid, 
                                                     impact_method_uuid, 
                                                     parameter_set.parameters)
     result.wait_until_ready()
@@ -1338,6 +1599,113 @@ def initiate_lca_model(client,
     
     return total_impacts, my_parameters, ps_uuid
 
+def initiate_lca_model_batch(client, 
+                             process_name, 
+                             process_description, 
+                             lca_df_finalized, 
+                             impact_method_uuid, 
+                             parameter_sets, 
+                             max_workers=4,
+                             refresh=False):
+    """
+    Run the LCA model for several parameter sets at once.
+
+    The process and product system are created (or reused, see
+    initiate_lca_model), then a parameter set is created and an analysis is
+    started for each entry of parameter_sets before any result is awaited,
+    so that openLCA calculates them concurrently.
+
+    Parameters
+    ----------
+    client : olca_ipc.Client
+        The IPC client object.
+    process_name : str
+        The name of the process.
+    process_description : str
+        The description of the process.
+    lca_df_finalized : pandas.DataFrame
+        The finalized LCA dataframe.
+    impact_method_uuid : str
+        The UUID of the impact method.
+    parameter_sets : list
+        A list of (parameter_set_name, parameter_set_description, is_baseline)
+        tuples.
+    max_workers : int, optional
+        The number of threads waiting on results. Defaults to 4.
+    refresh : bool, optional
+        Whether to create a new process and product system even if they were
+        already created for the same inputs. Defaults to False.
+
+    Returns
+    -------
+    total_impacts_list : list
+        The total impacts (pandas.DataFrame) for each parameter set, in the
+        same order as parameter_sets.
+    my_parameters : pandas.DataFrame
+        The parameters of the process.
+    ps_uuid : str
+        The UUID of the product system.
+    """
+    process_uuid, ps_uuid, my_parameters = _get_lca_model(client,
+                                                          process_name,
+                                                          process_description,
+                                                          lca_df_finalized,
+                                                          refresh)
+    redef_sets = []
+    for name, description, is_baseline in parameter_sets:
+        parameter_set = lca_prommis.run_analysis.create_parameter_set(client, 
+                                                                    process_uuid, 
+                                                                    ps_uuid, 
+                                                                    name, 
+                                                                    description, 
+                                                                    is_baseline,
+                                                                    replace=True)
+        redef_sets.append(parameter_set.parameters)
+    results = lca_prommis.run_analysis.run_analysis_batch(client, 
+                                                          ps_uuid, 
+                                                          impact_method_uuid, 
+                                                          redef_sets, 
+                                                          max_workers=max_workers)
+
+    def _wait_for_total_results(result):
+        result.wait_until_ready()
+        return lca_prommis.generate_total_results.generate_total_results(
+            result, save=False
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        total_impacts_list = list(executor.map(_wait_for_total_results, results))
+
+    return total_impacts_list, my_parameters, ps_uuid
+
+def _get_lca_model(client, process_name, process_description, lca_df_finalized, refresh=False):
+    """Helper function to create, or reuse, the process and product system.
+
+    Returns the process UUID, the product system UUID, and a copy of the
+    parameters table. The models are stored on the client object, keyed by
+    process name and a hash of the exchange table, so they are never reused
+    with another connection.
+    """
+    lca_models = getattr(client, "_lca_models", None)
+    if lca_models is None:
+        lca_models = {}
+        client._lca_models = lca_models
+    model_key = (
+        process_name,
+        hashlib.sha1(
+            pd.util.hash_pandas_object(lca_df_finalized).to_numpy()
+        ).hexdigest(),
+    )
+    if refresh or model_key not in lca_models:
+        process, my_parameters = lca_prommis.create_lca.create_new_process(client,
+                                                                            lca_df_finalized,
+                                                                            process_name,
+                                                                            process_description)
+        ps = lca_prommis.create_ps.create_ps(client, process.id)
+        lca_models[model_key] = (process.id, ps.id, my_parameters)
+    process_uuid, ps_uuid, my_parameters = lca_models[model_key]
+    return process_uuid, ps_uuid, my_parameters.copy()
+
 def initialize_decision_variables(nf_obj, m):
     """
     Initialize the decision variables.
@@ -1351,11 +1719,23 @@ def initialize_decision_variables(nf_obj, m):
     Returns
     -------
     None
+
+    Raises
+    ------
+    ValueError
+        If a decision variable is not found in the model.
     """
-    for dv in nf_obj.dv:
-        # Execution string to get current value from model
-        my_str = "m.%s.get_values().values()" % dv.ipvname
-        my_val = [x for x in eval(my_str)][0]
+    # Bind each decision variable to its Pyomo variable first;
+    # find_component resolves dotted names, including indexed blocks
+    model_vars = [(dv, m.find_component(dv.ipvname)) for dv in nf_obj.dv]
+    missing = [dv.ipvname for dv, my_var in model_vars if my_var is None]
+    if missing:
+        raise ValueError(f"Decision variables not found in model: {missing}")
+
+    log_info = logging.getLogger().isEnabledFor(logging.INFO)
+    for dv, my_var in model_vars:
+        # Get current value from model (first index of the variable)
+        my_val = next(iter(my_var.get_values().values()))
         # Use +- 10% for max and min
         my_min = my_val * 0.9
         my_max = my_val * 1.1
@@ -1367,11 +1747,11 @@ def initialize_decision_variables(nf_obj, m):
         # (scaled=True) lies inside bounds [lower, upper]; required by BOBYQA.
         dv.scaling = "Linear"
         # NOTE: distribution is uniform by default; can be changed later
-        logging.info(
-            "Set decision properties for %s: value=%f, min=%f, max=%f" % (
+        if log_info:
+            logging.info(
+                "Set decision properties for %s: value=%f, min=%f, max=%f",
                 dv.ipvname, my_val, my_min, my_max
             )
-        )
 
 def validate_optimization_problem(problem, session): # Work still in progress - See TODOs at line 1300
     """
@@ -1451,12 +1831,18 @@ def get_penalty_scales(objectives_list, ps_guide):
     penalty_scale_list : list
         The list of penalty scales for the selected objectives
     """
+    # Penalty scale by objective (the first row wins for duplicates), built
+    # once instead of masking the dataframe per objective
+    first_rows = ps_guide.drop_duplicates('objective')
+    scale_by_objective = dict(
+        zip(first_rows['objective'], first_rows['penalty_scale'])
+    )
     penalty_scale_list = []
 
     for objective in objectives_list:
-        if objective not in ps_guide['objective'].to_list():
+        if objective not in scale_by_objective:
             raise ValueError(f"Objective {objective} not found in ps_guide")
-        penalty_scale_list.append(ps_guide.loc[ps_guide['objective'] == objective, 'penalty_scale'].values[0])
+        penalty_scale_list.append(scale_by_objective[objective])
 
     return penalty_scale_list
 
@@ -1491,10 +1877,7 @@ def generate_prommis_outputs(nf_obj, m):
                         "product purity": value(m.fs.ree_product_purity_percentage[0])
     }
 
-    for output, value in prommis_outputs.items():
-        nf_obj.initiate_output_variables(nf_obj.prommis_node,
-                                        output,
-                                        value)
+    nf_obj.initiate_output_variables_bulk(nf_obj.prommis_node, prommis_outputs)
 
     prommis_outputs_df = pd.DataFrame(prommis_outputs.items(),columns=["output", "value"])
     prommis_outputs_df.to_csv(os.path.join(nf_obj.output_dir, "prommis_outputs.csv"), index=False)
@@ -1517,10 +1900,12 @@ def create_openlca_outputs(nf_obj, total_impacts, node_name):
     """
     Creates the openLCA outputs for the given impact categories
     """
-    for impact_category in total_impacts['name']:
-        nf_obj.initiate_output_variables(node_name, 
-                                    impact_category, 
-                                    total_impacts.loc[total_impacts['name'] == impact_category, 'amount'].values[0])
+    first_rows = total_impacts.drop_duplicates('name')
+    amount_by_name = dict(zip(first_rows['name'], first_rows['amount']))
+    nf_obj.initiate_output_variables_bulk(
+        node_name,
+        [(name, amount_by_name[name]) for name in total_impacts['name']]
+    )
 
 def get_optimization_results(client, ps_uuid, parameter_set_name, solver, decision_variables, prommis_outputs, parameters, total_impacts):
 
@@ -1587,26 +1972,11 @@ def get_optimization_results(client, ps_uuid, parameter_set_name, solver, decisi
 # SANDBOX
 #
 if __name__ == "__main__":
-    # Import and initialize NetlFoqus w/ UKy flowsheet
-    import src.foqus_class as foqus_class
-    from src.foqus_class import NetlFoqus
-    from src.foqus_class import openlca_node_script, prommis_node_script
-    import os
-    import logging
-    from pathlib import Path
-    import pandas as pd
-    import olca_schema as olca
+    # Initialize NetlFoqus w/ UKy flowsheet; the class, node scripts, and
+    # functions are already in scope (re-importing src.foqus_class here would
+    # load this file a second time, with a second NetlFoqus class)
     from netlolca.NetlOlca import NetlOlca
-    import prommis.uky.uky_flowsheet as uky
     from pyomo.environ import value
-    from pyomo.core.base.var import Var
-    import foqus_lib.framework.graph.graph as gr
-    import foqus_lib.framework.graph.nodeVars as nv
-    from foqus_lib.framework.uq.Distribution import Distribution
-    from foqus_lib.framework.session.session import session
-    from foqus_lib.framework.optimizer.problem import objectiveFunction, inequalityConstraint
-    import src as lca_prommis
-    import foqus_lib.framework.optimizer.NLopt as nlopt
 
     nf = NetlFoqus()
     m = nf.init_uky()
@@ -1620,7 +1990,7 @@ if __name__ == "__main__":
     nf.add_decision_variable(my_var2)
 
     # Help with initializing decision variables
-    foqus_class.initialize_decision_variables(nf, m)
+    initialize_decision_variables(nf, m)
     
     # Store decision variable information in a dataframe and save to output directory
     dv_data = []
@@ -1659,10 +2029,7 @@ if __name__ == "__main__":
                 "product purity": value(m.fs.ree_product_purity_percentage[0])
     }
     
-    for output, value in prommis_outputs.items():
-        nf.initiate_output_variables(nf.prommis_node,
-                                     output,
-                                     value)
+    nf.initiate_output_variables_bulk(nf.prommis_node, prommis_outputs)
 
     # export prommis outputs to the output directory
     prommis_outputs_df = pd.DataFrame(prommis_outputs.items(),columns=["output", "value"])
@@ -1698,7 +2065,7 @@ if __name__ == "__main__":
     parameter_set_name = "Baseline"
     parameter_set_description = "Baseline parameter set for the process"
     is_baseline = True
-    total_impacts, my_parameters, ps_uuid = foqus_class.initiate_lca_model (netl, 
+    total_impacts, my_parameters, ps_uuid = initiate_lca_model (netl, 
                                                                             process_name, 
                                                                             process_description, 
                                                                             lca_df_finalized, 
@@ -1722,17 +2089,12 @@ if __name__ == "__main__":
     my_parameters.to_csv(output_dir / "my_parameters.csv", index=False)
 
     # create output variables 
-    for impact_category in total_impacts['name']:
-        nf.initiate_output_variables(nf.olca_node, 
-                                    impact_category, 
-                                    total_impacts.loc[total_impacts['name'] == impact_category, 'amount'].values[0])
-        logging.info(
-            "Initiated output variable %s for node %s: amount=%f" % (
-            impact_category, 
-            nf.olca_node.name, 
-            total_impacts.loc[total_impacts['name'] == impact_category, 'amount'].values[0]
-            )
-        )
+    first_rows = total_impacts.drop_duplicates('name')
+    amount_by_name = dict(zip(first_rows['name'], first_rows['amount']))
+    nf.initiate_output_variables_bulk(
+        nf.olca_node,
+        [(name, amount_by_name[name]) for name in total_impacts['name']]
+    )
 
     nf.define_node_script(nf.olca_node, openlca_node_script)
 
@@ -1748,11 +2110,11 @@ if __name__ == "__main__":
     
     problem = nf.setup_optimizer(my_session, "NLopt", nf.prommis_node) # first step in setting up optimizer
 
-    ps_guide = foqus_class.generate_penalty_scales(prommis_outputs_df, total_impacts)
+    ps_guide = generate_penalty_scales(prommis_outputs_df, total_impacts)
 
     objectives_list =  ["Freshwater ecotoxicity", "total plant cost"]
     
-    penalty_scale_list = foqus_class.get_penalty_scales(objectives_list, ps_guide)
+    penalty_scale_list = get_penalty_scales(objectives_list, ps_guide)
 
     # problem = nf.create_problem_objective_singular(problem,                                         
     #                                             ["Freshwater ecotoxicity"], 
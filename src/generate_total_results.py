@@ -29,31 +29,78 @@ This script includes a function to extract the total LCIA results from a openLCA
 
 The function takes one argument (the result object returned from
 Run_analysis.py) and returns a data frame with the total environmental impacts.
+Callers that only read the names and amounts can use generate_total_records,
+which returns the same rows as a list of dictionaries, without pandas.
 
 """
 __all__ = [
+    "generate_total_records",
     "generate_total_results",
 ]
 
 
+###############################################################################
+# GLOBALS
+###############################################################################
+TOTAL_IMPACT_COLUMNS = ['amount', 'name', 'units', 'uuid']
+'''list : Columns (record keys) of the total impacts.'''
+
+
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
 def extract_impacts(ps):
     return (ps['name'], ps['ref_unit'], ps['id'])
 
-def generate_total_results(result):
-    # Extract results - total impacts
-    total_impacts = result.get_total_impacts()
-    total_impacts_df = pd.DataFrame(total_impacts)
-    # Parse the name, units, and UUID from impact categories
-    total_impacts_df['temp'] = total_impacts_df['impact_category'].apply(extract_impacts)
-    total_impacts_df['name'] = total_impacts_df['temp'].str.get(0)
-    total_impacts_df['units'] = total_impacts_df['temp'].str.get(1)
-    total_impacts_df['uuid'] = total_impacts_df['temp'].str.get(2)
-    total_impacts_df = total_impacts_df.drop(columns=['temp', 'impact_category'])    
+def generate_total_records(result):
+    """Return the total impacts of a result as a list of records.
+
+    Parameters
+    ----------
+    result : olca_ipc.Result
+        A result object, ready to be read (see run_analysis).
+
+    Returns
+    -------
+    list
+        A dictionary per impact category, with the keys in
+        TOTAL_IMPACT_COLUMNS (i.e., the impact amount and the impact
+        category name, units, and uuid).
+    """
+    return [
+        {
+            'amount': iv.amount,
+            'name': iv.impact_category.name,
+            'units': iv.impact_category.ref_unit,
+            'uuid': iv.impact_category.id,
+        }
+        for iv in result.get_total_impacts()
+    ]
+
+def generate_total_results(result, save=True):
+    """Return the total impacts of a result as a data frame.
+
+    Parameters
+    ----------
+    result : olca_ipc.Result
+        A result object, ready to be read (see run_analysis).
+    save : bool, optional
+        Whether to write the data frame to output/total_impacts.csv (relative
+        to the working directory). Defaults to True.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The total impacts, with the impact category name, units, and uuid
+        as columns.
+    """
+    # Extract results - total impacts, with the name, units, and UUID
+    # parsed from the impact categories in a single pass
+    total_impacts_df = pd.DataFrame.from_records(
+        generate_total_records(result), columns=TOTAL_IMPACT_COLUMNS
+    )
     # Save results
-    if not os.path.exists("output"):
-        os.makedirs("output")
-    total_impacts_df.to_csv("output/total_impacts.csv", index=False)
+    if save:
+        os.makedirs("output", exist_ok=True)
+        total_impacts_df.to_csv("output/total_impacts.csv", index=False)
     return total_impacts_df
@@ -39,8 +39,7 @@ def import_db(resource_id):
     # NOTE: this resource path assumes working directory is the same as the
     # Jupyter notebook.
     resources_path = os.path.abspath(os.path.join(os.getcwd(), 'resources'))
-    if not os.path.exists(resources_path):
-        os.makedirs(resources_path)
+    os.makedirs(resources_path, exist_ok=True)
     output_dir = resources_path
     download_edx(resource_id, api_key, output_dir)
     return True
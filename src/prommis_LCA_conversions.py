@@ -6,6 +6,8 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
+import functools
+
 import pandas as pd
 from pyomo.environ import units
 from pyomo.environ import value
@@ -147,6 +149,9 @@ unit_display_mapping = {
 }
 '''dict : Map units to display names.'''
 
+_molar_masses = {}
+'''dict : Molar masses (g/mol) found in PubChem, by compound name.'''
+
 
 ###############################################################################
 # FUNCTIONS
@@ -441,6 +446,8 @@ def get_molar_mass(compound_name):
     -   Uses the first compound found if multiple matches exist
     -   Calculates molecular weight from molecular formula using pymatgen
     -   Provides comprehensive error handling and warning messages
+    -   Molar masses that are found are kept in memory, so each compound is
+        only looked up once; failed lookups are retried on the next call
 
     Examples
     --------
@@ -464,6 +471,9 @@ def get_molar_mass(compound_name):
         print(f"Warning: Cannot get molar mass for '{compound_name}' - pubchempy/pymatgen not available")
         return None
 
+    if compound_name in _molar_masses:
+        return _molar_masses[compound_name]
+
     try:
         compounds = pcp.get_compounds(compound_name, 'name')
         if not compounds:
@@ -477,12 +487,14 @@ def get_molar_mass(compound_name):
             return None
 
         composition = Composition(formula)
+        _molar_masses[compound_name] = composition.weight
         return composition.weight
     except Exception as e:
         print(f"Error getting molar mass for '{compound_name}': {e}")
         return None
 
 
+@functools.lru_cache(maxsize=256)
 def parse_unit_to_pyomo(unit_str):
     """
     Helper function to parse and convert unit string to Pyomo unit expression.
@@ -513,6 +525,8 @@ def parse_unit_to_pyomo(unit_str):
     -   Handles exponents using '**' or '^' symbols
     -   Does not recognize parentheses in unit strings
     -   May not handle units not recognized by Pyomo
+    -   Results are cached by unit string, since flowsheets reuse a small
+        set of unit strings
 
     The following are known limitations:
 
@@ -6,6 +6,8 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
+from concurrent.futures import ThreadPoolExecutor
+
 import olca_schema as olca
 
 
@@ -32,16 +34,89 @@ The function takes two main arguments/inputs:
 
 The function returns the result.
 
+To create or update several parameter sets of the same product system with a
+single write to openLCA, pass a ParameterSetBatch to create_parameter_set and
+update_parameter, then call its flush method.
+
 """
 __all__ = [
+    "ParameterSetBatch",
+    "create_parameter_sets_bulk",
     "run_analysis",
+    "run_analysis_batch",
 ]
 
 
+###############################################################################
+# GLOBALS
+###############################################################################
+# amount, flow_property, nw_set and unit are left at their None defaults
+# (omitted, the code will use the FU, its flow property and unit)
+_DEFAULT_SETUP_KWARGS = dict(
+    allocation=olca.AllocationType.USE_DEFAULT_ALLOCATION,
+    with_costs=False, # no costs are considered in the current model
+    with_regionalization=False, # no regionalization is considered in the current model
+)
+'''dict : The calculation setup fields that are the same for every run.'''
+
+
+###############################################################################
+# CLASSES
+###############################################################################
+class ParameterSetBatch(object):
+    """
+    A product system held in memory while its parameter sets are created or
+    updated, so that the changes are written to openLCA with a single put.
+
+    Parameters
+    ----------
+    client : olca_ipc.Client
+        The IPC client object.
+    ps_uuid : str
+        The UUID of the product system.
+    """
+    def __init__(self, client, ps_uuid):
+        self.client = client
+        self.ps_obj = client.query(olca.ProductSystem, ps_uuid)
+        self._set_index = None
+
+    def add_parameter_sets(self, parameter_sets, replace=False):
+        """Add parameter sets to the batch's product system (see
+        _add_parameter_set for replace)."""
+        for parameter_set in parameter_sets:
+            _add_parameter_set(self.ps_obj, parameter_set, replace)
+            if self._set_index is None:
+                continue
+            if replace:
+                self._set_index[parameter_set.name] = parameter_set
+            else:
+                self._set_index.setdefault(parameter_set.name, parameter_set)
+
+    def get_parameter_set(self, parameter_set_name):
+        """Return the first parameter set with the given name.
+
+        The name index is built on the first call and reused afterwards.
+
+        Raises
+        ------
+        KeyError
+            If the product system has no parameter set with the given name.
+        """
+        if self._set_index is None:
+            self._set_index = {}
+            for parameter_set in (self.ps_obj.parameter_sets or []):
+                self._set_index.setdefault(parameter_set.name, parameter_set)
+        return self._set_index[parameter_set_name]
+
+    def flush(self):
+        """Write the product system (and its parameter sets) to openLCA."""
+        self.client.client.put(self.ps_obj)
+
+
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
-def create_parameter_set (client, process_uuid, ps_uuid, parameter_set_name, description, is_baseline):
+def create_parameter_set (client, process_uuid, ps_uuid, parameter_set_name, description, is_baseline, batch=None, ps_obj=None, replace=False):
     """
     Create a parameter set for a product system in openLCA.
     
@@ -59,47 +134,158 @@ def create_parameter_set (client, process_uuid, ps_uuid, parameter_set_name, des
         The description of the parameter set.
     is_baseline : bool
         Whether the parameter set is a baseline parameter set.
+    batch : ParameterSetBatch, optional
+        If given, the parameter set is added to the batch's product system
+        and is not written to openLCA until the batch is flushed.
+    ps_obj : olca_schema.ProductSystem, optional
+        A product system object already queried by the caller (e.g., to be
+        passed on to update_parameter); if given, it is not queried again.
+        Ignored when batch is given.
+    replace : bool, optional
+        Whether to replace an existing parameter set with the same name
+        (e.g., when a model is initiated again for the same product system)
+        instead of adding another one. Defaults to False.
     
     Returns
     -------
     parameter_set : olca_schema.ParameterRedefSet
         The parameter set object.
     """
-    # get process object
-    process_obj = client.query(olca.Process, process_uuid)
+    # get process object; the product system is queried at the same time
+    # (on a second thread), since the two requests are independent
+    if batch is None and ps_obj is not None:
+        process_obj = client.query(olca.Process, process_uuid)
+        ps = ps_obj
+    elif batch is None:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            ps_future = executor.submit(client.query, olca.ProductSystem, ps_uuid)
+            process_obj = client.query(olca.Process, process_uuid)
+            ps = ps_future.result()
+    else:
+        process_obj = client.query(olca.Process, process_uuid)
+        ps = batch.ps_obj
+    parameter_set = _new_parameter_set(process_obj, 
+                                       parameter_set_name, 
+                                       description, 
+                                       is_baseline)
+    # save parameter set object
+    if batch is None:
+        _add_parameter_set(ps, parameter_set, replace)
+        client.client.put(ps)
+    else:
+        batch.add_parameter_sets([parameter_set], replace)
+
+    return parameter_set
+
+def _add_parameter_set(ps_obj, parameter_set, replace=False):
+    """Helper function to add a parameter set to a product system.
+
+    If replace is True, the first parameter set with the same name (if any)
+    is replaced in place; otherwise, the parameter set is appended.
+    """
+    if not isinstance (ps_obj.parameter_sets, list):
+        ps_obj.parameter_sets = []
+    if replace:
+        for i, x in enumerate(ps_obj.parameter_sets):
+            if x.name == parameter_set.name:
+                ps_obj.parameter_sets[i] = parameter_set
+                return
+    ps_obj.parameter_sets.append(parameter_set)
+
+def _new_parameter_set(process_obj, parameter_set_name, description, is_baseline):
+    """Helper function to create a parameter set that redefines all the
+    parameters of a process (see create_parameter_set)."""
     # get reference flow type
-    ref_exch = next(x for x in process_obj.exchanges if x.is_quantitative_reference)
+    ref_exch = _get_ref_exchange(process_obj)
     ref_flow_type = ref_exch.flow.flow_type
     context = olca.Ref (id = process_obj.id, 
-                        category = process_obj.category if process_obj.category else None, 
-                        description=process_obj.description if process_obj.description else None, 
+                        category = process_obj.category or None, 
+                        description=process_obj.description or None, 
                         flow_type = ref_flow_type, 
-                        library=process_obj.library if process_obj.library else None, 
+                        library=process_obj.library or None, 
                         location = process_obj.location.name if process_obj.location else None, 
                         name = process_obj.name, 
                         process_type = process_obj.process_type, 
                         ref_unit = ref_exch.flow_property.ref_unit, 
                         ref_type = olca.RefType.Process)
-    # loop through parameters in the process
-    parameters = []
-    for param in process_obj.parameters:
-        parameters.append(olca.ParameterRedef(context = context, description = param.description, is_protected = False, name = param.name, uncertainty = param.uncertainty, value = param.value))
+    # redefine each parameter of the process
+    parameters = [
+        olca.ParameterRedef(context = context, description = param.description, is_protected = False, name = param.name, uncertainty = param.uncertainty, value = param.value)
+        for param in (process_obj.parameters or [])
+    ]
     # create parameter set object
     parameter_set = olca.ParameterRedefSet(name = parameter_set_name, description = description, is_baseline = is_baseline, parameters = parameters)
-    # save parameter set object
-    ps = client.query(olca.ProductSystem, ps_uuid)
-    if isinstance (ps.parameter_sets, list):
-        ps.parameter_sets.append(parameter_set)
-    else:
-        ps.parameter_sets = [parameter_set]
-    client.client.put(ps)
-
     return parameter_set
 
+def create_parameter_sets_bulk(client, ps_uuid, specs, max_workers=8):
+    """
+    Create several parameter sets for a product system in openLCA.
+
+    Each distinct process is queried once (the queries are overlapped on a
+    thread pool), and the product system is written to openLCA once.
+
+    Parameters
+    ----------
+    client : olca_ipc.Client
+        The IPC client object.
+    ps_uuid : str
+        The UUID of the product system.
+    specs : list
+        A list of (process_uuid, parameter_set_name, description,
+        is_baseline) tuples (see create_parameter_set).
+    max_workers : int, optional
+        The maximum number of concurrent process queries. Defaults to 8.
+
+    Returns
+    -------
+    list
+        The olca_schema.ParameterRedefSet objects, in the same order as
+        specs.
+    """
+    specs = list(specs)
+    if not specs:
+        return []
+    batch = ParameterSetBatch(client, ps_uuid)
+    process_uuids = list(dict.fromkeys(spec[0] for spec in specs))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(process_uuids))) as executor:
+        processes = dict(zip(
+            process_uuids,
+            executor.map(lambda x: client.query(olca.Process, x), process_uuids)
+        ))
+    parameter_sets = [
+        _new_parameter_set(processes[process_uuid], name, description, is_baseline)
+        for process_uuid, name, description, is_baseline in specs
+    ]
+    batch.add_parameter_sets(parameter_sets)
+    batch.flush()
+
+    return parameter_sets
+
+def _get_ref_exchange(process_obj):
+    """Helper function to return the quantitative reference exchange of a
+    process.
+
+    Raises
+    ------
+    ValueError
+        If the process has no quantitative reference exchange.
+    """
+    ref_exch = next(
+        (x for x in (process_obj.exchanges or []) if x.is_quantitative_reference),
+        None
+    )
+    if ref_exch is None:
+        raise ValueError(
+            f"Process {process_obj.name} has no quantitative reference exchange."
+        )
+    return ref_exch
+
 def update_parameter(client, 
                     ps_uuid, 
                     parameter_set_name, 
-                    new_parameter_set):
+                    new_parameter_set,
+                    batch=None,
+                    ps_obj=None):
     """
     This function updates the parameter set for a given product system
     
@@ -122,32 +308,42 @@ def update_parameter(client,
     new_parameter_set: df
         A dataframe with the new parameter set.
         Contains at least two columns: parameter_name and parameter_value
+    batch : ParameterSetBatch, optional
+        If given, the parameter set of the batch's product system is updated
+        and is not written to openLCA until the batch is flushed.
+    ps_obj : olca_schema.ProductSystem, optional
+        A product system object already queried by the caller (e.g., the
+        one passed to create_parameter_set); if given, it is not queried
+        again. Ignored when batch is given.
     
     Returns
     -------
-    None
+    parameter_set_obj : olca_schema.ParameterRedefSet
+        The updated parameter set object.
     """
 
-    # get product system object
-    ps_obj = client.query(olca.ProductSystem, ps_uuid)
-    # get parameter set that has a name == parameter_set_name
-    parameter_set_obj = next(x for x in ps_obj.parameter_sets if x.name == parameter_set_name)
+    # get product system object and the parameter set that has a
+    # name == parameter_set_name (a batch indexes its sets by name once)
+    if batch is not None:
+        ps_obj = batch.ps_obj
+        parameter_set_obj = batch.get_parameter_set(parameter_set_name)
+    else:
+        if ps_obj is None:
+            ps_obj = client.query(olca.ProductSystem, ps_uuid)
+        parameter_set_obj = next(x for x in ps_obj.parameter_sets if x.name == parameter_set_name)
+    # new parameter values by name (the first row wins for duplicate names),
+    # built once instead of masking the dataframe per parameter
+    first_rows = new_parameter_set.drop_duplicates('parameter_name')
+    new_values = dict(
+        zip(first_rows['parameter_name'], first_rows['parameter_value'])
+    )
     # loop through parameters in parameter set
     for param in parameter_set_obj.parameters:
-        # get parameter name
-        param_name = param.name
-        # get new parameter value
-        param.value = (
-            new_parameter_set.loc[
-                new_parameter_set['parameter_name'] == param_name,
-                'parameter_value'
-            ].iloc[0]
-            if param_name in new_parameter_set['parameter_name'].values
-            # if parameter name is not in new_parameter_set, keep the original value
-            else param.value
-        )
+        # if parameter name is not in new_parameter_set, keep the original value
+        param.value = new_values.get(param.name, param.value)
     
-    client.client.put(ps_obj)
+    if batch is None:
+        client.client.put(ps_obj)
 
     return parameter_set_obj
 
@@ -175,26 +371,61 @@ def run_analysis(client, ps_uuid, impact_method_uuid, parameter_set):
     # Define the impact method
     # In this project, the method is defined in a pre-setup database
     # as such, the uuid of the method is less likely to change
-    # define method using uuid
-    impact_method_ref = client.client.get(olca.ImpactMethod, impact_method_uuid)
+    # define method using uuid; the calculation setup only needs references,
+    # so they are built locally instead of fetching the objects over IPC
+    impact_method_ref = olca.Ref(
+        id=impact_method_uuid, ref_type=olca.RefType.ImpactMethod
+    )
 
-    # Define product system object
-    ps_ref = client.client.get(olca.ProductSystem, ps_uuid)
+    # Define product system reference
+    ps_ref = olca.Ref(id=ps_uuid, ref_type=olca.RefType.ProductSystem)
 
     # build the calculation setup
-    setup = olca.CalculationSetup()
-    setup.allocation = olca.AllocationType.USE_DEFAULT_ALLOCATION
-    setup.amount = None # omitted, the code will use the FU
-    setup.flow_property = None # omitted, the code will use the FU flow property
-    setup.impact_method = impact_method_ref
-    setup.nw_set = None
-    setup.parameters = parameter_set
-    setup.target = ps_ref
-    setup.unit = None # omitted, the code will use the FU unit
-    setup.with_costs = False # no costs are considered in the current model
-    setup.with_regionalization = False # no regionalization is considered in the current model
+    setup = olca.CalculationSetup(
+        **_DEFAULT_SETUP_KWARGS,
+        impact_method=impact_method_ref,
+        parameters=parameter_set,
+        target=ps_ref,
+    )
 
     # Run and Generate Result
     result = client.client.calculate(setup)
 
-    return result
\ No newline at end of file
+    return result
+
+def run_analysis_batch(client, ps_uuid, impact_method_uuid, parameter_sets, max_workers=8):
+    """
+    This function starts the analysis of a product system in openLCA for
+    several parameter sets, overlapping the IPC requests on a thread pool.
+
+    Parameters
+    ----------
+    client : olca_ipc.Client
+        The IPC client object.
+    ps_uuid : str
+        The UUID of the product system.
+    impact_method_uuid : str
+        The UUID of the impact method.
+    parameter_sets : list
+        The parameter sets (lists of olca_schema.ParameterRedef objects, as
+        for run_analysis) to be used in the analyses.
+    max_workers : int, optional
+        The maximum number of concurrent requests. Defaults to 8.
+
+    Returns
+    -------
+    list
+        The LCA results (see run_analysis), in the same order as
+        parameter_sets. Each result still needs to be waited on (e.g., with
+        wait_until_ready).
+    """
+    parameter_sets = list(parameter_sets)
+    if not parameter_sets:
+        return []
+    workers = min(max_workers, len(parameter_sets))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            lambda parameter_set: run_analysis(
+                client, ps_uuid, impact_method_uuid, parameter_set),
+            parameter_sets
+        ))
\ No newline at end of file